@@ -0,0 +1,270 @@
+"""
+Advanced ECG Analysis Module for Cardiology ML System
+Author: Cardiology ML Team
+Date: $(date +%Y-%m-%d)
+"""
+
+import os
+import sys
+import numpy as np
+import matplotlib.pyplot as plt
+from typing import Tuple, Dict, List, Union
+import neurokit2 as nk
+import biosppy
+import warnings
+warnings.filterwarnings('ignore')
+
+# The shared ECG tools are not part of the installed package: run from the
+# repository root or put it on PYTHONPATH
+# (e.g. python -m src.python.ecg_analyzer)
+from tools.data_processing.recordings import Recording, open_recording
+from tools.ecg_analysis.baseline import estimate_baseline
+from tools.ecg_analysis.filter_bank import zero_phase_filter
+
+class ECGAdvancedAnalyzer:
+    """Advanced ECG signal processing and analysis for cardiology assessment"""
+    
+    def __init__(self, sampling_rate: int = 500, baseline_method: str = 'decimated_median'):
+        """
+        Initialize ECG analyzer with sampling rate
+        
+        Args:
+            sampling_rate: Sampling frequency in Hz (default: 500)
+            baseline_method: Baseline wander estimator of preprocess_ecg (see
+                tools.ecg_analysis.baseline.BASELINE_METHODS; 'median' is the
+                exact 1 s running median)
+        """
+        self.sampling_rate = sampling_rate
+        self.baseline_method = baseline_method
+        self.industry_standards = {
+            'hr_normal_range': (60, 100),
+            'qtc_normal_max': 440,
+            'pr_normal_range': (120, 200),
+            'qrs_normal_max': 120
+        }
+    
+    def load_ecg_signal(self, file_path: str, start: int = 0, stop: int = None, leads=None,
+                        lazy: bool = False, cache_dir: str = None, **raw_options) -> Union[np.ndarray, Recording]:
+        """
+        Load ECG signal from various formats
+        
+        .npy and raw binary (.bin/.raw) files are memory-mapped; CSV and .mat
+        files are converted once into a columnar int16 cache and memory-mapped
+        from there; WFDB (.hea/.dat, format 16/212) and EDF records are
+        decoded in place. Only the requested samples are read.
+        
+        Args:
+            file_path: Path to ECG data file
+            start: First sample to load
+            stop: End sample (exclusive; default: end of recording)
+            leads: Lead index/name or list of them (default: the first numeric column
+                of a CSV file, every lead of other formats)
+            lazy: Return the Recording view instead of reading samples
+            cache_dir: Directory of the converted-file cache
+            raw_options: Layout of raw binary files (see open_raw)
+            
+        Returns:
+            ECG signal as numpy array (1-D for a single lead, else
+            n_leads x n_samples), or the lazy Recording
+        """
+        recording = open_recording(file_path, self.sampling_rate, cache_dir, **raw_options)
+        if lazy:
+            return recording
+        
+        if leads is None and file_path.endswith('.csv'):
+            leads = 0
+        return recording.read(start, stop, leads)
+    
+    def preprocess_ecg(self, raw_signal: np.ndarray) -> np.ndarray:
+        """
+        Preprocess ECG signal: filtering, baseline removal, noise reduction
+        
+        Args:
+            raw_signal: Raw ECG signal
+            
+        Returns:
+            Cleaned ECG signal
+        """
+        # Bandpass filter (0.5-40 Hz for ECG)
+        filtered = zero_phase_filter(raw_signal, self.sampling_rate, (0.5, 40.0), 3)
+        
+        # Remove baseline wander
+        baseline = estimate_baseline(filtered, self.sampling_rate, self.baseline_method)
+        cleaned = filtered - baseline
+        
+        return cleaned
+    
+    def detect_qrs_complexes(self, ecg_signal: np.ndarray) -> Dict:
+        """
+        Detect QRS complexes using Pan-Tompkins algorithm
+        
+        Args:
+            ecg_signal: Preprocessed ECG signal
+            
+        Returns:
+            Dictionary with QRS detection results
+        """
+        try:
+            # Use NeuroKit2 for robust QRS detection
+            signals, info = nk.ecg_process(ecg_signal, sampling_rate=self.sampling_rate)
+            r_peaks = info['ECG_R_Peaks']
+            
+            # Calculate intervals
+            rr_intervals = np.diff(r_peaks) / self.sampling_rate * 1000  # in ms
+            
+            results = {
+                'r_peaks': r_peaks,
+                'rr_intervals': rr_intervals,
+                'heart_rate': 60000 / np.mean(rr_intervals) if len(rr_intervals) > 0 else 0,
+                'hrv': np.std(rr_intervals) if len(rr_intervals) > 0 else 0,
+                'detection_method': 'NeuroKit2 Pan-Tompkins'
+            }
+            
+            return results
+        except Exception as e:
+            # Fallback to BioSPPY
+            from biosppy.signals import ecg
+            out = ecg.ecg(signal=ecg_signal, sampling_rate=self.sampling_rate, show=False)
+            r_peaks = out['rpeaks']
+            rr_intervals = np.diff(r_peaks) / self.sampling_rate * 1000
+            
+            results = {
+                'r_peaks': r_peaks,
+                'rr_intervals': rr_intervals,
+                'heart_rate': out['heart_rate'],
+                'hrv': np.std(rr_intervals) if len(rr_intervals) > 0 else 0,
+                'detection_method': 'BioSPPY'
+            }
+            
+            return results
+    
+    def calculate_advanced_metrics(self, ecg_signal: np.ndarray, r_peaks: np.ndarray) -> Dict:
+        """
+        Calculate advanced cardiology metrics
+        
+        Args:
+            ecg_signal: ECG signal
+            r_peaks: Indices of R peaks
+            
+        Returns:
+            Dictionary with advanced metrics
+        """
+        metrics = {}
+        
+        # Basic metrics
+        metrics['mean_heart_rate'] = 60000 / np.mean(np.diff(r_peaks)) * self.sampling_rate if len(r_peaks) > 1 else 0
+        
+        # ST segment analysis
+        st_segment_analysis = self._analyze_st_segment(ecg_signal, r_peaks)
+        metrics.update(st_segment_analysis)
+        
+        # QT interval analysis
+        qt_analysis = self._analyze_qt_interval(ecg_signal, r_peaks)
+        metrics.update(qt_analysis)
+        
+        # Arrhythmia detection
+        arrhythmia = self._detect_arrhythmia(r_peaks)
+        metrics.update(arrhythmia)
+        
+        # Industry standard compliance
+        metrics['industry_standard_compliance'] = self._check_industry_standards(metrics)
+        
+        return metrics
+    
+    def _analyze_st_segment(self, ecg_signal: np.ndarray, r_peaks: np.ndarray) -> Dict:
+        """Analyze ST segment for ischemia detection"""
+        # Placeholder for ST segment analysis
+        return {
+            'st_elevation_mm': 0.0,
+            'st_depression_mm': 0.0,
+            'st_slope_mv_per_s': 0.0,
+            'ischemia_risk_score': 0.0
+        }
+    
+    def _analyze_qt_interval(self, ecg_signal: np.ndarray, r_peaks: np.ndarray) -> Dict:
+        """Analyze QT interval for arrhythmia risk"""
+        # Placeholder for QT interval analysis
+        return {
+            'qt_interval_ms': 400.0,
+            'qtc_interval_ms': 420.0,
+            'qt_dispersion_ms': 40.0,
+            'torsades_risk': 'Low'
+        }
+    
+    def _detect_arrhythmia(self, r_peaks: np.ndarray) -> Dict:
+        """Detect various arrhythmia patterns"""
+        if len(r_peaks) < 2:
+            return {'arrhythmia_type': 'Insufficient data', 'confidence': 0.0}
+        
+        rr_intervals = np.diff(r_peaks)
+        rr_cv = np.std(rr_intervals) / np.mean(rr_intervals)
+        
+        if rr_cv > 0.15:
+            arrhythmia_type = 'Atrial Fibrillation suspected'
+        elif rr_cv < 0.05:
+            arrhythmia_type = 'Regular rhythm'
+        else:
+            arrhythmia_type = 'Normal sinus rhythm with variations'
+        
+        return {
+            'arrhythmia_type': arrhythmia_type,
+            'rr_coefficient_of_variation': rr_cv,
+            'confidence': min(rr_cv * 5, 1.0)
+        }
+    
+    def _check_industry_standards(self, metrics: Dict) -> Dict:
+        """Check metrics against industry standards"""
+        compliance = {}
+        
+        # Heart rate compliance
+        hr = metrics.get('mean_heart_rate', 0)
+        compliance['heart_rate_normal'] = self.industry_standards['hr_normal_range'][0] <= hr <= self.industry_standards['hr_normal_range'][1]
+        
+        # QTc compliance
+        qtc = metrics.get('qtc_interval_ms', 0)
+        compliance['qtc_normal'] = qtc <= self.industry_standards['qtc_normal_max']
+        
+        return compliance
+    
+    def generate_report(self, metrics: Dict) -> str:
+        """
+        Generate comprehensive cardiology report
+        
+        Args:
+            metrics: Dictionary with ECG metrics
+            
+        Returns:
+            Formatted report string
+        """
+        report = []
+        report.append("=" * 60)
+        report.append("CARDIOLOGY ECG ANALYSIS REPORT")
+        report.append("=" * 60)
+        report.append(f"Heart Rate: {metrics.get('mean_heart_rate', 0):.1f} bpm")
+        report.append(f"HRV: {metrics.get('hrv', 0):.1f} ms")
+        report.append(f"Arrhythmia: {metrics.get('arrhythmia_type', 'N/A')}")
+        report.append(f"QTc Interval: {metrics.get('qtc_interval_ms', 0):.1f} ms")
+        report.append(f"Industry Standard Compliance: {metrics.get('industry_standard_compliance', {})}")
+        report.append("=" * 60)
+        
+        return "\n".join(report)
+
+def main():
+    """Main function for testing ECG analyzer"""
+    print("Initializing Cardiology ECG Analyzer...")
+    analyzer = ECGAdvancedAnalyzer(sampling_rate=500)
+    
+    # Create sample ECG data for demonstration
+    t = np.linspace(0, 10, 5000)
+    sample_ecg = np.sin(2 * np.pi * 1 * t) + 0.5 * np.sin(2 * np.pi * 5 * t) + 0.1 * np.random.randn(len(t))
+    
+    print("Processing ECG signal...")
+    cleaned = analyzer.preprocess_ecg(sample_ecg)
+    qrs_results = analyzer.detect_qrs_complexes(cleaned)
+    metrics = analyzer.calculate_advanced_metrics(cleaned, qrs_results['r_peaks'])
+    
+    report = analyzer.generate_report(metrics)
+    print(report)
+
+if __name__ == "__main__":
+    main()
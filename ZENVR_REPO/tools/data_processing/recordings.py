@@ -0,0 +1,678 @@
+"""
+ECG Recording Loader
+Memory-mapped, lazily windowed access to multi-lead recordings on disk
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import numpy as np
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Rows parsed per block while streaming a CSV file
+CSV_BLOCK_ROWS = 1 << 16
+# Samples per lead transposed at once while writing the columnar cache
+CACHE_BLOCK_SAMPLES = 1 << 18
+# Bumped whenever the cache layout changes, forcing re-conversion
+CACHE_FORMAT = 1
+# Digital value of missing samples in the int16 cache
+CACHE_INVALID = -32768
+# Digital value marking missing samples, per WFDB storage format
+WFDB_INVALID = {'16': -32768, '61': -32768, '212': -2048}
+
+Leads = Union[None, int, str, Sequence[Union[int, str]]]
+
+
+class Recording:
+    """
+    Lazy view of a multi-lead recording stored as digital samples
+
+    Samples stay wherever they are (typically an np.memmap) until a time
+    range is read; physical values are (digital - baseline) / gain per lead.
+    """
+
+    def __init__(self, samples: np.ndarray, sampling_rate: float, gain=1.0, baseline=0.0,
+                 lead_names: List[str] = None, time_axis: int = 1, invalid: int = None):
+        """
+        Args:
+            samples: 2-D sample store, (n_leads, n_samples) or (n_samples, n_leads)
+            sampling_rate: Sampling frequency in Hz
+            gain: Digital units per physical unit (scalar or per lead)
+            baseline: Digital value of physical zero (scalar or per lead)
+            lead_names: Name of each lead (default: '0', '1', ...)
+            time_axis: Axis of samples that is time (1 for columnar stores)
+            invalid: Digital value marking missing samples (read as NaN)
+        """
+        if samples.ndim != 2:
+            raise ValueError("samples must be 2-D")
+        self.samples = samples
+        self.sampling_rate = sampling_rate
+        self.time_axis = time_axis
+        n_leads = samples.shape[1 - time_axis]
+        self.gain = np.broadcast_to(np.asarray(gain, dtype=np.float64), (n_leads,)).copy()
+        self.baseline = np.broadcast_to(np.asarray(baseline, dtype=np.float64), (n_leads,)).copy()
+        self.gain[self.gain == 0] = 1.0
+        self.lead_names = list(lead_names) if lead_names is not None else [str(i) for i in range(n_leads)]
+        self.invalid = invalid
+
+    @property
+    def n_leads(self) -> int:
+        return self.samples.shape[1 - self.time_axis]
+
+    @property
+    def n_samples(self) -> int:
+        return self.samples.shape[self.time_axis]
+
+    @property
+    def duration(self) -> float:
+        """Length in seconds"""
+        return self.n_samples / self.sampling_rate
+
+    def __len__(self) -> int:
+        return self.n_samples
+
+    def _lead_index(self, leads: Leads) -> List[int]:
+        if leads is None:
+            return list(range(self.n_leads))
+        if isinstance(leads, (int, np.integer, str)):
+            leads = [leads]
+        return [self.lead_names.index(lead) if isinstance(lead, str) else int(lead) for lead in leads]
+
+    def digital(self, start: int = 0, stop: int = None, leads: Leads = None) -> np.ndarray:
+        """Stored samples of [start, stop) as (n_selected_leads, n) without scaling"""
+        start, stop, _ = slice(start, stop).indices(self.n_samples)
+        index = self._lead_index(leads)
+        if self.time_axis == 1:
+            return self.samples[index, start:stop]
+        return self.samples[start:stop, index].T
+
+    def read(self, start: int = 0, stop: int = None, leads: Leads = None) -> np.ndarray:
+        """
+        Physical samples of [start, stop)
+
+        Only the requested range and leads are touched on disk.
+
+        Args:
+            start: First sample
+            stop: End sample (exclusive; default: end of recording)
+            leads: Lead index or name, or a list of them (default: all)
+
+        Returns:
+            1-D array for a single lead (an int/str selection, or a
+            single-lead recording), otherwise (n_leads, n) float64
+        """
+        index = self._lead_index(leads)
+        digital = self.digital(start, stop, index)
+        physical = (digital - self.baseline[index, None]) / self.gain[index, None]
+        if self.invalid is not None:
+            physical[digital == self.invalid] = np.nan
+        if isinstance(leads, (int, np.integer, str)) or (leads is None and self.n_leads == 1):
+            return physical[0]
+        return physical
+
+    def lead(self, lead: Union[int, str]) -> 'LeadView':
+        """1-D sliceable view of one lead (usable with overlapping_chunks)"""
+        return LeadView(self, self._lead_index(lead)[0])
+
+    def windows(self, window: int, hop: int = None, leads: Leads = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Read the recording window by window
+
+        Args:
+            window: Window length in samples
+            hop: Samples between window starts (default: window)
+            leads: Lead selection as in read
+
+        Yields:
+            (start, samples) for every full window
+        """
+        hop = hop or window
+        for start in range(0, self.n_samples - window + 1, hop):
+            yield start, self.read(start, start + window, leads)
+
+
+class LeadView:
+    """Single lead of a Recording, read lazily through slicing"""
+
+    def __init__(self, recording: Recording, lead: int):
+        self.recording = recording
+        self.lead = lead
+
+    @property
+    def shape(self) -> Tuple[int]:
+        return (self.recording.n_samples,)
+
+    def __len__(self) -> int:
+        return self.recording.n_samples
+
+    def __getitem__(self, key) -> np.ndarray:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.recording.n_samples)
+            return self.recording.read(start, stop, self.lead)[::step]
+        index = range(self.recording.n_samples)[key]
+        return self.recording.read(index, index + 1, self.lead)[0]
+
+
+def open_npy(path: str, sampling_rate: float) -> Recording:
+    """Memory-map an .npy array; the shorter axis of a 2-D array is taken as leads"""
+    samples = np.load(path, mmap_mode='r')
+    if samples.ndim == 1:
+        return Recording(samples[None, :], sampling_rate)
+    return Recording(samples, sampling_rate, time_axis=int(samples.shape[0] <= samples.shape[1]))
+
+
+def open_raw(path: str, sampling_rate: float, dtype='<i2', n_leads: int = 1, gain=1.0, baseline=0.0,
+             header_bytes: int = 0, interleaved: bool = True, lead_names: List[str] = None,
+             invalid: int = None) -> Recording:
+    """
+    Memory-map a headerless binary sample file
+
+    Args:
+        path: File path
+        sampling_rate: Sampling frequency in Hz
+        dtype: Sample type, including byte order
+        n_leads: Number of leads
+        gain, baseline: Digital-to-physical conversion (see Recording)
+        header_bytes: Bytes to skip at the start of the file
+        interleaved: Samples stored frame by frame (all leads of a time
+            point together) rather than lead after lead
+        lead_names: Name of each lead
+        invalid: Digital value marking missing samples
+    """
+    dtype = np.dtype(dtype)
+    n_samples = (os.path.getsize(path) - header_bytes) // (dtype.itemsize * n_leads)
+    shape = (n_samples, n_leads) if interleaved else (n_leads, n_samples)
+    samples = np.memmap(path, dtype=dtype, mode='r', offset=header_bytes, shape=shape)
+    return Recording(samples, sampling_rate, gain, baseline, lead_names,
+                     time_axis=0 if interleaved else 1, invalid=invalid)
+
+
+def _csv_blocks(path: str) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """
+    (column names, rows x columns float block) of the numeric columns of a CSV file with a header row
+
+    Column types are inferred from the first block; only the numeric
+    columns are parsed (as float64) and the others, e.g. labels, skipped.
+    """
+    if PYARROW_AVAILABLE:
+        schema = pa_csv.open_csv(path).schema
+        names = [field.name for field in schema
+                 if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+                 or pa.types.is_null(field.type)]
+        if not names:
+            return
+        options = pa_csv.ConvertOptions(include_columns=names,
+                                        column_types={name: pa.float64() for name in names})
+        for batch in pa_csv.open_csv(path, convert_options=options):
+            yield names, np.column_stack([column.to_numpy(zero_copy_only=False) for column in batch.columns])
+        return
+
+    import pandas as pd
+    head = pd.read_csv(path, nrows=CSV_BLOCK_ROWS)
+    columns = [i for i, dtype in enumerate(head.dtypes) if dtype.kind in 'iuf']
+    if not columns:
+        return
+    for frame in pd.read_csv(path, usecols=columns, dtype=np.float64, chunksize=CSV_BLOCK_ROWS):
+        yield [str(name) for name in frame.columns], frame.to_numpy()
+
+
+def _source_stamp(path: str) -> Dict:
+    stat = os.stat(path)
+    return {'format': CACHE_FORMAT, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_cache(blocks: Iterator[np.ndarray], target: str, lead_names: List[str], source: Dict = None) -> None:
+    """
+    Quantize time-major sample blocks into a columnar int16 cache
+
+    The blocks are spooled once to a float32 scratch file while each lead's
+    range is tracked, then written lead-major to `target`.npy with the
+    per-lead gain and baseline that map the range onto the int16 scale.
+    Missing (NaN) samples are stored as CACHE_INVALID.
+
+    Args:
+        blocks: (rows, n_leads) arrays in time order
+        target: Cache path without extension (.npy samples, .json metadata)
+        lead_names: Name of each lead
+        source: Stamp of the source file, checked before reusing the cache
+    """
+    directory = os.path.dirname(os.path.abspath(target))
+    os.makedirs(directory, exist_ok=True)
+
+    # Both files are written under temporary names and renamed into place, so
+    # concurrent conversions of one source never see each other's partial files
+    temporaries = []
+    for suffix in ('.npy', '.json'):
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=suffix + '.tmp')
+        os.close(descriptor)
+        temporaries.append(temporary)
+    try:
+        _write_cache_files(blocks, temporaries, lead_names, source)
+        os.replace(temporaries[0], target + '.npy')
+        os.replace(temporaries[1], target + '.json')
+    except BaseException:
+        for temporary in temporaries:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        raise
+
+
+def _write_cache_files(blocks: Iterator[np.ndarray], paths: List[str], lead_names: List[str],
+                       source: Dict) -> None:
+    """Samples and metadata of write_cache, into the given (.npy, .json) paths"""
+    n_leads = len(lead_names)
+    low = np.full(n_leads, np.inf)
+    high = np.full(n_leads, -np.inf)
+    n_samples = 0
+    directory = os.path.dirname(paths[0])
+
+    with tempfile.TemporaryFile(dir=directory) as scratch:
+        for block in blocks:
+            block = np.asarray(block, dtype=np.float32).reshape(-1, n_leads)
+            with np.errstate(invalid='ignore'):
+                low = np.fmin(low, np.nanmin(block, axis=0, initial=np.inf))
+                high = np.fmax(high, np.nanmax(block, axis=0, initial=-np.inf))
+            scratch.write(block.tobytes())
+            n_samples += len(block)
+        scratch.flush()
+
+        finite = np.isfinite(low)
+        middle = np.where(finite, (low + high) / 2, 0.0)
+        half_range = np.where(finite, (high - low) / 2, 0.0)
+        gain = np.where(half_range > 0, 32767 / np.where(half_range > 0, half_range, 1.0), 1.0)
+        baseline = -middle * gain
+
+        samples = np.lib.format.open_memmap(paths[0], mode='w+', dtype=np.int16, shape=(n_leads, n_samples))
+        if n_samples:
+            spooled = np.memmap(scratch, dtype=np.float32, mode='r', shape=(n_samples, n_leads))
+            for start in range(0, n_samples, CACHE_BLOCK_SAMPLES):
+                block = spooled[start:start + CACHE_BLOCK_SAMPLES].T * gain[:, None] + baseline[:, None]
+                block = np.rint(np.clip(block, -32767, 32767))
+                samples[:, start:start + CACHE_BLOCK_SAMPLES] = np.where(np.isnan(block), CACHE_INVALID, block)
+            del spooled
+        samples.flush()
+        del samples
+
+    with open(paths[1], 'w') as handle:
+        json.dump({'lead_names': list(lead_names), 'gain': gain.tolist(), 'baseline': baseline.tolist(),
+                   'source': source}, handle)
+
+
+def open_cache(target: str, sampling_rate: float) -> Recording:
+    """Memory-map a cache written by write_cache"""
+    with open(target + '.json') as handle:
+        meta = json.load(handle)
+    samples = np.load(target + '.npy', mmap_mode='r')
+    return Recording(samples, sampling_rate, meta['gain'], meta['baseline'], meta['lead_names'],
+                     invalid=CACHE_INVALID)
+
+
+def _cache_is_current(target: str, source_path: str) -> bool:
+    try:
+        with open(target + '.json') as handle:
+            meta = json.load(handle)
+    except (OSError, ValueError):
+        return False
+    return meta.get('source') == _source_stamp(source_path) and os.path.exists(target + '.npy')
+
+
+def _user_cache_dir() -> str:
+    """Per-user directory of converted recordings (under XDG_CACHE_HOME, default ~/.cache)"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ecg_recordings')
+
+
+def _cache_targets(path: str, cache_dir: str = None) -> List[str]:
+    """Cache paths (without extension) to try for a source file, preferred first"""
+    name = os.path.basename(path)
+    if cache_dir:
+        return [os.path.join(cache_dir, name)]
+    source = os.path.abspath(path)
+    # Sources from different directories share the user cache
+    digest = hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+    return [os.path.join(os.path.dirname(source), '.ecg_cache', name),
+            os.path.join(_user_cache_dir(), f'{name}-{digest}')]
+
+
+def _open_converted(path: str, sampling_rate: float, cache_dir: str,
+                    convert: Callable[[], Tuple[List[str], Iterator[np.ndarray]]]) -> Recording:
+    """
+    Memory-map the columnar cache of a source file, converting it when missing or stale
+
+    Without a cache_dir the cache goes to a .ecg_cache directory next to the
+    file or, where that cannot be written (e.g. read-only archives), to the
+    per-user cache; if neither can be written the converted samples are
+    held in memory instead.
+
+    Args:
+        convert: Returns the lead names and the time-major sample blocks
+    """
+    targets = _cache_targets(path, cache_dir)
+    for target in targets:
+        if _cache_is_current(target, path):
+            return open_cache(target, sampling_rate)
+
+    for target in targets:
+        names, blocks = convert()
+        try:
+            write_cache(blocks, target, names, _source_stamp(path))
+        except OSError:
+            if cache_dir:
+                raise
+            continue
+        return open_cache(target, sampling_rate)
+
+    names, blocks = convert()
+    blocks = [np.asarray(block, dtype=np.float64).reshape(-1, len(names)) for block in blocks]
+    samples = np.concatenate(blocks).T if blocks else np.zeros((len(names), 0))
+    return Recording(np.ascontiguousarray(samples), sampling_rate, lead_names=names)
+
+
+def open_csv(path: str, sampling_rate: float, cache_dir: str = None) -> Recording:
+    """
+    Open a CSV recording (one numeric column per lead, with a header row;
+    non-numeric columns are skipped)
+
+    The file is streamed block by block into the columnar cache on first
+    use; later calls memory-map the cache until the CSV changes.
+    """
+    def convert():
+        blocks = _csv_blocks(path)
+        first = next(blocks, None)
+        names = first[0] if first is not None else []
+
+        def sample_blocks():
+            if first is not None:
+                yield first[1]
+            for _, block in blocks:
+                yield block
+
+        return names, sample_blocks()
+
+    return _open_converted(path, sampling_rate, cache_dir, convert)
+
+
+def open_mat(path: str, sampling_rate: float, cache_dir: str = None, variable: str = 'ecg_signal') -> Recording:
+    """Open a MATLAB recording, converting `variable` into the columnar cache on first use"""
+    def convert():
+        from scipy.io import loadmat
+        data = np.asarray(loadmat(path)[variable], dtype=np.float64)
+        if data.ndim < 2 or 1 in data.shape:
+            data = data.reshape(-1, 1)
+        elif data.shape[0] < data.shape[1]:
+            data = data.T
+        return [str(i) for i in range(data.shape[1])], iter([data])
+
+    return _open_converted(path, sampling_rate, cache_dir, convert)
+
+
+class _Format212:
+    """Frame-interleaved WFDB format 212 samples (two 12-bit values per 3 bytes), decoded on access"""
+
+    ndim = 2
+    dtype = np.dtype(np.int16)
+
+    def __init__(self, path: str, n_signals: int, byte_offset: int = 0, n_samples: int = None):
+        self.bytes = np.memmap(path, dtype=np.uint8, mode='r', offset=byte_offset)
+        self.n_signals = n_signals
+        if n_samples is None:
+            n_samples = len(self.bytes) * 2 // 3 // n_signals
+        self.shape = (n_samples, n_signals)
+
+    def _decode(self, first: int, stop: int) -> np.ndarray:
+        """Flat samples [first, stop) of the interleaved stream"""
+        lo, hi = first - first % 2, stop + stop % 2
+        raw = np.asarray(self.bytes[3 * lo // 2:3 * hi // 2], dtype=np.int16)
+        raw = np.pad(raw, (0, (-len(raw)) % 3)).reshape(-1, 3)
+        values = np.empty(2 * len(raw), dtype=np.int16)
+        values[0::2] = raw[:, 0] | ((raw[:, 1] & 0x0F) << 8)
+        values[1::2] = raw[:, 2] | ((raw[:, 1] & 0xF0) << 4)
+        # Sign-extend the 12-bit two's complement values
+        values[values >= 2048] -= 4096
+        return values[first - lo:stop - lo]
+
+    def __getitem__(self, key) -> np.ndarray:
+        rows, columns = key
+        start, stop, _ = rows.indices(self.shape[0])
+        stop = max(start, stop)
+        frames = self._decode(start * self.n_signals, stop * self.n_signals).reshape(-1, self.n_signals)
+        return frames[:, columns]
+
+
+class _SignalGroups:
+    """Signals spread over several equally long (n_samples, k) stores, in header order"""
+
+    ndim = 2
+
+    def __init__(self, stores: List, columns: List[Tuple[int, int]]):
+        """
+        Args:
+            stores: Time-major sample stores (memmaps or decoders)
+            columns: (store, column) of every signal
+        """
+        self.stores = stores
+        self.columns = columns
+        self.shape = (min(store.shape[0] for store in stores), len(columns))
+        self.dtype = np.result_type(*[store.dtype for store in stores])
+
+    def __getitem__(self, key) -> np.ndarray:
+        rows, index = key
+        start, stop, _ = rows.indices(self.shape[0])
+        index = range(len(self.columns))[index] if isinstance(index, slice) else np.atleast_1d(index)
+        block = np.empty((max(0, stop - start), len(index)), dtype=self.dtype)
+        for store in range(len(self.stores)):
+            selected = [i for i, signal in enumerate(index) if self.columns[signal][0] == store]
+            if selected:
+                columns = [self.columns[index[i]][1] for i in selected]
+                block[:, selected] = self.stores[store][start:stop, columns]
+        return block
+
+
+_WFDB_FORMAT = re.compile(r'^(\d+)(?:x(\d+))?(?::(\d+))?(?:\+(\d+))?$')
+_WFDB_GAIN = re.compile(r'^([-+\d.eE]+)(?:\(([-+\d]+)\))?(?:/(\S+))?$')
+
+
+def _read_wfdb_header(path: str) -> Tuple[Dict, List[Dict]]:
+    with open(path) as handle:
+        lines = [line.split('#')[0].strip() for line in handle]
+    lines = [line for line in lines if line]
+
+    fields = lines[0].split()
+    if '/' in fields[0]:
+        raise ValueError("multi-segment WFDB records are not supported")
+    n_signals = int(fields[1])
+    record = {
+        'sampling_rate': float(re.split(r'[/(]', fields[2])[0]) if len(fields) > 2 else 250.0,
+        'n_samples': int(fields[3]) if len(fields) > 3 else None,
+    }
+
+    signals = []
+    for line in lines[1:1 + n_signals]:
+        tokens = line.split()
+        storage = _WFDB_FORMAT.match(tokens[1])
+        if storage is None:
+            raise ValueError(f"invalid WFDB format field {tokens[1]!r}")
+        fmt, samples_per_frame, skew, byte_offset = storage.groups()
+        if fmt not in WFDB_INVALID:
+            raise ValueError(f"WFDB format {fmt} is not supported (16, 61 and 212 are)")
+        if int(samples_per_frame or 1) != 1 or int(skew or 0) != 0:
+            raise ValueError("multi-frequency or skewed WFDB signals are not supported")
+
+        gain, baseline = 200.0, None
+        if len(tokens) > 2:
+            calibration = _WFDB_GAIN.match(tokens[2])
+            gain = float(calibration.group(1)) or 200.0
+            baseline = int(calibration.group(2)) if calibration.group(2) is not None else None
+        adc_zero = int(tokens[4]) if len(tokens) > 4 else 0
+        signals.append({
+            'file': tokens[0], 'format': fmt, 'byte_offset': int(byte_offset or 0),
+            'gain': gain, 'baseline': adc_zero if baseline is None else baseline,
+            'name': ' '.join(tokens[8:]) if len(tokens) > 8 else str(len(signals)),
+        })
+    return record, signals
+
+
+def open_wfdb(path: str) -> Recording:
+    """
+    Open a WFDB record (format 16, 61 or 212) without decoding it
+
+    Format 16/61 signal files are memory-mapped as (n_samples, n_signals)
+    int16 frames; format 212 files are memory-mapped as bytes and only the
+    frames of a requested range are unpacked.
+
+    Args:
+        path: Header (.hea) or signal (.dat) file, or the record path
+            without extension
+    """
+    record_path = os.path.splitext(path)[0] if path.endswith(('.hea', '.dat')) else path
+    record, signals = _read_wfdb_header(record_path + '.hea')
+    directory = os.path.dirname(os.path.abspath(record_path))
+
+    stores, columns, files = [], [], {}
+    for signal_spec in signals:
+        files.setdefault(signal_spec['file'], []).append(signal_spec)
+    for file_name, group in files.items():
+        fmt, byte_offset = group[0]['format'], group[0]['byte_offset']
+        file_path = os.path.join(directory, file_name)
+        if fmt == '212':
+            store = _Format212(file_path, len(group), byte_offset, record['n_samples'])
+        else:
+            dtype = np.dtype('<i2' if fmt == '16' else '>i2')
+            n_samples = record['n_samples']
+            if n_samples is None:
+                n_samples = (os.path.getsize(file_path) - byte_offset) // (2 * len(group))
+            store = np.memmap(file_path, dtype=dtype, mode='r', offset=byte_offset, shape=(n_samples, len(group)))
+        stores.append(store)
+    for signal_spec in signals:
+        store = list(files).index(signal_spec['file'])
+        columns.append((store, files[signal_spec['file']].index(signal_spec)))
+
+    formats = {signal_spec['format'] for signal_spec in signals}
+    samples = stores[0] if len(stores) == 1 else _SignalGroups(stores, columns)
+    return Recording(samples, record['sampling_rate'], [s['gain'] for s in signals],
+                     [s['baseline'] for s in signals], [s['name'] for s in signals], time_axis=0,
+                     invalid=WFDB_INVALID[formats.pop()] if len(formats) == 1 else None)
+
+
+class _EDFRecords:
+    """Signals of equal rate inside fixed-size EDF data records, read record by record"""
+
+    ndim = 2
+    dtype = np.dtype('<i2')
+
+    def __init__(self, path: str, header_bytes: int, n_records: int, record_samples: List[int],
+                 signals: List[int]):
+        """
+        Args:
+            path: EDF file
+            header_bytes: Size of the header
+            n_records: Number of data records
+            record_samples: Samples per record of every signal in the file
+            signals: Signals exposed (all with the same samples per record)
+        """
+        self.record_length = record_samples[signals[0]]
+        record_words = int(np.sum(record_samples))
+        self.records = np.memmap(path, dtype='<i2', mode='r', offset=header_bytes,
+                                 shape=(n_records, record_words))
+        self.offsets = np.concatenate(([0], np.cumsum(record_samples)))[signals]
+        self.shape = (n_records * self.record_length, len(signals))
+
+    def __getitem__(self, key) -> np.ndarray:
+        rows, index = key
+        start, stop, _ = rows.indices(self.shape[0])
+        stop = max(start, stop)
+        first, last = start // self.record_length, -(-stop // self.record_length)
+        offsets = np.atleast_1d(self.offsets[index])
+        # (records, signals, samples) block covering the range
+        words = offsets[:, None] + np.arange(self.record_length)
+        block = self.records[first:last][:, words]
+        frames = block.transpose(0, 2, 1).reshape(-1, len(offsets))
+        return frames[start - first * self.record_length:stop - first * self.record_length]
+
+
+def open_edf(path: str, signals: Sequence[Union[int, str]] = None) -> Recording:
+    """
+    Open an EDF/EDF+ file without reading its data records
+
+    A Recording needs equally sampled leads, so by default the ordinary
+    signals sharing the most common rate are exposed (EDF+ annotation
+    channels are skipped).
+
+    Args:
+        path: EDF file
+        signals: Signal indices or labels to expose instead
+    """
+    with open(path, 'rb') as handle:
+        fixed = handle.read(256).decode('ascii', errors='replace')
+        header_bytes = int(fixed[184:192])
+        n_records = int(fixed[236:244])
+        record_duration = float(fixed[244:252])
+        n_signals = int(fixed[252:256])
+        text = handle.read(n_signals * 256).decode('ascii', errors='replace')
+
+    def field(offset: int, width: int) -> List[str]:
+        start = offset * n_signals
+        return [text[start + i * width:start + (i + 1) * width].strip() for i in range(n_signals)]
+
+    labels = field(0, 16)
+    physical_min = np.array(field(104, 8), dtype=np.float64)
+    physical_max = np.array(field(112, 8), dtype=np.float64)
+    digital_min = np.array(field(120, 8), dtype=np.float64)
+    digital_max = np.array(field(128, 8), dtype=np.float64)
+    record_samples = [int(value) for value in field(216, 8)]
+    if n_records < 0:
+        n_records = (os.path.getsize(path) - header_bytes) // (2 * sum(record_samples))
+
+    if signals is None:
+        ordinary = [i for i, label in enumerate(labels) if label != 'EDF Annotations']
+        rates = [record_samples[i] for i in ordinary]
+        common = max(set(rates), key=rates.count)
+        signals = [i for i in ordinary if record_samples[i] == common]
+    else:
+        signals = [labels.index(s) if isinstance(s, str) else int(s) for s in signals]
+        if len({record_samples[i] for i in signals}) > 1:
+            raise ValueError("selected EDF signals have different sampling rates")
+
+    # physical = (digital - digital_min) * span_p / span_d + physical_min
+    gain = (digital_max - digital_min) / (physical_max - physical_min)
+    baseline = digital_min - physical_min * gain
+    samples = _EDFRecords(path, header_bytes, n_records, record_samples, signals)
+    return Recording(samples, record_samples[signals[0]] / record_duration, gain[signals], baseline[signals],
+                     [labels[i] for i in signals], time_axis=0)
+
+
+def open_recording(path: str, sampling_rate: float, cache_dir: str = None, **raw_options) -> Recording:
+    """
+    Open a recording lazily by file extension
+
+    .npy files and raw binary files (.bin/.raw, described by raw_options as
+    in open_raw) are memory-mapped in place; CSV and .mat files are
+    converted once into a columnar int16 cache under cache_dir (default: a
+    .ecg_cache directory next to the file, else a per-user cache) and
+    memory-mapped from there.
+    WFDB (.hea/.dat) and EDF files are read natively at the sampling rate
+    they record.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npy':
+        return open_npy(path, sampling_rate)
+    if extension in ('.bin', '.raw'):
+        return open_raw(path, sampling_rate, **raw_options)
+    if extension == '.csv':
+        return open_csv(path, sampling_rate, cache_dir)
+    if extension == '.mat':
+        return open_mat(path, sampling_rate, cache_dir)
+    if extension in ('.hea', '.dat'):
+        return open_wfdb(path)
+    if extension == '.edf':
+        return open_edf(path)
+    raise ValueError("Unsupported file format")
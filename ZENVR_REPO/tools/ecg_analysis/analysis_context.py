@@ -0,0 +1,105 @@
+"""
+ECG Analysis Context
+Per-signal cache of intermediates shared by the ECG analysis tools
+"""
+
+import numpy as np
+from scipy import signal as sp_signal
+from typing import Callable, Hashable, Tuple
+
+
+class SignalContext:
+    """
+    Caches statistics, spectra and derived signals computed from one ECG signal
+
+    The signal may also be an (n_leads, n_samples) array; statistics and
+    spectra then reduce along the last (time) axis and hold one value per lead.
+    """
+
+    # Cached entries holding one value (or row) per lead
+    LEAD_KEYS = ('mean', 'var', 'std', 'power', 'median', 'percentile', 'baseline_lowpass', 'filtered')
+
+    def __init__(self, ecg_signal: np.ndarray, sampling_rate: int = 500):
+        self.signal = np.asarray(ecg_signal)
+        self.sampling_rate = sampling_rate
+        self._cache = {}
+
+    @classmethod
+    def ensure(cls, ecg_signal: np.ndarray, sampling_rate: int,
+               context: 'SignalContext' = None) -> 'SignalContext':
+        """Return the given context, or a fresh one for ecg_signal"""
+        if context is not None:
+            if context.sampling_rate != sampling_rate or context.signal.shape != np.shape(ecg_signal):
+                raise ValueError("Analysis context does not belong to this signal")
+            return context
+        return cls(ecg_signal, sampling_rate)
+
+    def cached(self, key: Hashable, builder: Callable[[], object]):
+        """Return the value stored under key, building it on first use"""
+        if key not in self._cache:
+            self._cache[key] = builder()
+        return self._cache[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._cache
+
+    def store(self, key: Hashable, value) -> None:
+        """Seed the cache with an externally computed value"""
+        self._cache[key] = value
+
+    def derive(self, name: str, builder: Callable[[], np.ndarray]) -> 'SignalContext':
+        """Context for a signal derived from this one (e.g. the filtered ECG)"""
+        return self.cached(('derived', name), lambda: SignalContext(builder(), self.sampling_rate))
+
+    @property
+    def n_leads(self) -> int:
+        """Leads in the signal (1 for a 1-D signal)"""
+        return 1 if self.signal.ndim == 1 else self.signal.shape[0]
+
+    def lead(self, index: int) -> 'SignalContext':
+        """
+        Context of one lead of a multi-lead signal
+
+        Per-lead statistics, spectra, filtered signals and derived contexts
+        already computed for all leads are inherited, so batched work is not
+        repeated.
+        """
+        def build():
+            child = SignalContext(self.signal[index], self.sampling_rate)
+            for key, value in self._cache.items():
+                name = key[0] if isinstance(key, tuple) else key
+                if name == 'welch':
+                    child.store(key, (value[0], value[1][index]))
+                elif name == 'derived':
+                    child.store(key, value.lead(index))
+                elif name in self.LEAD_KEYS:
+                    child.store(key, value[index])
+            return child
+        return self.cached(('lead', index), build)
+
+    def mean(self) -> float:
+        return self.cached('mean', lambda: np.mean(self.signal, axis=-1))
+
+    def var(self) -> float:
+        return self.cached('var', lambda: np.var(self.signal, axis=-1))
+
+    def std(self) -> float:
+        # np.std is the square root of np.var, so both share one pass
+        return self.cached('std', lambda: np.sqrt(self.var()))
+
+    def power(self) -> float:
+        """Mean squared amplitude"""
+        return self.cached('power', lambda: np.mean(np.square(self.signal), axis=-1))
+
+    def median(self) -> float:
+        return self.cached('median', lambda: np.median(self.signal, axis=-1))
+
+    def percentile(self, q: float) -> float:
+        return self.cached(('percentile', q), lambda: np.percentile(self.signal, q, axis=-1))
+
+    def welch(self, nperseg: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+        """Welch PSD with segments of min(nperseg, n_samples) samples"""
+        nperseg = min(nperseg, self.signal.shape[-1])
+        return self.cached(('welch', nperseg), lambda: sp_signal.welch(
+            self.signal, fs=self.sampling_rate, nperseg=nperseg
+        ))
@@ -0,0 +1,169 @@
+"""
+ECG Baseline Estimation
+Baseline wander estimators: exact and decimated running medians, morphology and PR-knot splines
+"""
+
+import numpy as np
+from scipy import ndimage, signal
+from scipy.interpolate import CubicSpline
+
+# Estimators accepted by estimate_baseline
+BASELINE_METHODS = ('median', 'decimated_median', 'morphological', 'spline')
+
+# Samples per block of the decimated median's first stage, per running-median window
+DECIMATED_BLOCKS = 25
+
+# Rate (Hz) of the block means the morphological cascade runs on
+MORPHOLOGY_RATE = 50
+
+# Window before each R-peak (seconds) that holds the isoelectric PR segment
+PR_WINDOW = (-0.10, -0.06)
+
+
+def median_baseline(ecg_signal: np.ndarray, kernel: int) -> np.ndarray:
+    """Exact running median (scipy.signal.medfilt, zero-padded edges) along the last axis"""
+    kernel = kernel | 1
+    ecg_signal = np.asarray(ecg_signal, dtype=np.float64)
+    if ecg_signal.ndim == 1:
+        return signal.medfilt(ecg_signal, kernel_size=kernel)
+    return np.apply_along_axis(signal.medfilt, -1, ecg_signal, kernel)
+
+
+def _blocks(x: np.ndarray, factor: int) -> np.ndarray:
+    """(..., n_blocks, factor) view of consecutive blocks, the last one edge-padded"""
+    n_blocks = -(-x.shape[-1] // factor)
+    padding = [(0, 0)] * (x.ndim - 1) + [(0, n_blocks * factor - x.shape[-1])]
+    return np.pad(x, padding, mode='edge').reshape(x.shape[:-1] + (n_blocks, factor))
+
+
+def _upsample(values: np.ndarray, factor: int, n: int) -> np.ndarray:
+    """Linear interpolation of per-block values (at block centres) onto n samples"""
+    centres = np.arange(values.shape[-1]) * factor + (factor - 1) / 2
+    positions = np.arange(n)
+    # np.interp holds the edge values beyond the outer centres
+    rows = [np.interp(positions, centres, row) for row in values.reshape(-1, values.shape[-1])]
+    return np.reshape(rows, values.shape[:-1] + (n,))
+
+
+def decimated_median_baseline(ecg_signal: np.ndarray, kernel: int, factor: int = None) -> np.ndarray:
+    """
+    Two-stage approximation of a running median of `kernel` samples
+
+    Stage one takes the median of consecutive blocks of `factor` samples,
+    stage two a running median over kernel / factor block medians; the
+    result is interpolated back to the sampling grid. Only the short second
+    stage slides a window, over factor times fewer points.
+
+    Args:
+        ecg_signal: Signal, or (n_leads, n_samples)
+        kernel: Running-median window in samples
+        factor: Block length (default: about DECIMATED_BLOCKS blocks per window)
+
+    Returns:
+        Baseline with the shape of ecg_signal
+    """
+    x = np.asarray(ecg_signal, dtype=np.float64)
+    n = x.shape[-1]
+    # An odd block length makes each block median a single partition element
+    factor = (factor or max(1, kernel // DECIMATED_BLOCKS)) | 1
+    if n == 0 or factor >= n:
+        return np.broadcast_to(np.median(x, axis=-1, keepdims=True), x.shape).copy()
+
+    block_medians = np.partition(_blocks(x, factor), factor // 2, axis=-1)[..., factor // 2]
+    size = [1] * (x.ndim - 1) + [max(1, kernel // factor) | 1]
+    return _upsample(ndimage.median_filter(block_medians, size=size, mode='nearest'), factor, n)
+
+
+def morphological_baseline(ecg_signal: np.ndarray, sampling_rate: float) -> np.ndarray:
+    """
+    Baseline from an opening-closing cascade, smoothed by a moving average
+
+    The opening (0.2 s flat element) removes the QRS and other peaks, the
+    closing (0.3 s) fills the pits they leave, and a 0.2 s moving average
+    smooths the steps. The cascade runs on block means at about
+    MORPHOLOGY_RATE Hz and is interpolated back; each stage is an O(n)
+    min/max/mean filter.
+    """
+    x = np.asarray(ecg_signal, dtype=np.float64)
+    n = x.shape[-1]
+    factor = max(1, int(sampling_rate // MORPHOLOGY_RATE))
+    if n == 0 or factor >= n:
+        return np.broadcast_to(np.mean(x, axis=-1, keepdims=True), x.shape).copy()
+
+    reduced = _blocks(x, factor).mean(axis=-1)
+    rate = sampling_rate / factor
+    opening = max(1, int(round(0.2 * rate)))
+    closing = max(1, int(round(0.3 * rate)))
+
+    baseline = ndimage.maximum_filter1d(ndimage.minimum_filter1d(reduced, opening, mode='nearest'), opening,
+                                        mode='nearest')
+    baseline = ndimage.minimum_filter1d(ndimage.maximum_filter1d(baseline, closing, mode='nearest'), closing,
+                                        mode='nearest')
+    return _upsample(ndimage.uniform_filter1d(baseline, opening, mode='nearest'), factor, n)
+
+
+def _pr_knots(ecg_signal: np.ndarray, sampling_rate: float, r_peaks: np.ndarray):
+    """Knot times and (per lead) median level of the PR window of every beat"""
+    start, stop = (int(round(edge * sampling_rate)) for edge in PR_WINDOW)
+    r_peaks = np.unique(np.asarray(r_peaks, dtype=np.int64))
+    r_peaks = r_peaks[(r_peaks + start >= 0) & (r_peaks + stop <= ecg_signal.shape[-1])]
+    if len(r_peaks) == 0:
+        return r_peaks, ecg_signal[..., :0]
+
+    windows = r_peaks[:, None] + np.arange(start, max(stop, start + 1))
+    levels = np.median(ecg_signal[..., windows], axis=-1)
+    return r_peaks + (start + stop) / 2, levels
+
+
+def spline_baseline(ecg_signal: np.ndarray, sampling_rate: float, r_peaks: np.ndarray = None) -> np.ndarray:
+    """
+    Cubic spline through the isoelectric PR level of every beat
+
+    Args:
+        ecg_signal: Signal, or (n_leads, n_samples) sharing the R-peaks
+        sampling_rate: Sampling frequency in Hz
+        r_peaks: R-peak sample indices (default: peaks of the
+            morphologically detrended signal)
+
+    Returns:
+        Baseline with the shape of ecg_signal; held constant before the
+        first and after the last knot, and the decimated median when fewer
+        than two beats are usable
+    """
+    x = np.asarray(ecg_signal, dtype=np.float64)
+    if r_peaks is None:
+        detrended = np.abs(x - morphological_baseline(x, sampling_rate))
+        envelope = detrended if x.ndim == 1 else np.max(detrended, axis=0)
+        r_peaks, _ = signal.find_peaks(envelope, height=0.5 * np.percentile(envelope, 99.5),
+                                       distance=max(1, int(0.3 * sampling_rate)))
+
+    times, levels = _pr_knots(x, sampling_rate, r_peaks)
+    if len(times) < 2:
+        return decimated_median_baseline(x, int(sampling_rate) + 1)
+
+    spline = CubicSpline(times, levels, axis=-1)
+    return spline(np.clip(np.arange(x.shape[-1]), times[0], times[-1]))
+
+
+def estimate_baseline(ecg_signal: np.ndarray, sampling_rate: float, method: str = 'decimated_median',
+                      r_peaks: np.ndarray = None) -> np.ndarray:
+    """
+    Baseline wander of a signal (or of each lead) by the selected estimator
+
+    Args:
+        ecg_signal: Signal, or (n_leads, n_samples)
+        sampling_rate: Sampling frequency in Hz
+        method: One of BASELINE_METHODS; 'median' is the exact one-second
+            running median, the others approximate it at a fraction of the cost
+        r_peaks: R-peak indices for the 'spline' method (detected if missing)
+    """
+    kernel = int(sampling_rate) + 1
+    if method == 'median':
+        return median_baseline(ecg_signal, kernel)
+    if method == 'decimated_median':
+        return decimated_median_baseline(ecg_signal, kernel)
+    if method == 'morphological':
+        return morphological_baseline(ecg_signal, sampling_rate)
+    if method == 'spline':
+        return spline_baseline(ecg_signal, sampling_rate, r_peaks)
+    raise ValueError(f"Unknown baseline method {method!r}; expected one of {BASELINE_METHODS}")
@@ -0,0 +1,87 @@
+"""
+ECG Beat Matrix
+Vectorized beat segmentation and beat-to-beat similarity
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Tuple
+
+
+def beat_matrix(ecg_signal: np.ndarray, r_peaks: np.ndarray, before: int,
+                after: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack fixed windows around R-peaks into a (n_beats, before + after) matrix
+
+    Args:
+        ecg_signal: 1-D ECG signal
+        r_peaks: R-peak sample indices
+        before: Samples kept before each R-peak
+        after: Samples kept from each R-peak onwards
+
+    Returns:
+        Beat matrix (beats whose window would cross the signal edges are
+        dropped) and the R-peaks of the kept rows
+    """
+    ecg_signal = np.asarray(ecg_signal)
+    r_peaks = np.asarray(r_peaks, dtype=np.int64)
+    width = before + after
+    if width <= 0 or len(ecg_signal) < width:
+        return np.empty((0, max(width, 0)), dtype=ecg_signal.dtype), r_peaks[:0]
+
+    kept = r_peaks[(r_peaks >= before) & (r_peaks + after <= len(ecg_signal))]
+    return sliding_window_view(ecg_signal, width)[kept - before], kept
+
+
+def beat_similarity(beats: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation between every pair of beats (rows)
+
+    One normalized matrix product; rows with zero variance correlate as NaN,
+    like np.corrcoef.
+    """
+    beats = np.asarray(beats, dtype=np.float64)
+    centred = beats - beats.mean(axis=1, keepdims=True)
+    norms = np.sqrt(np.einsum('ij,ij->i', centred, centred))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        unit = centred / norms[:, None]
+    similarity = unit @ unit.T
+    return np.clip(similarity, -1.0, 1.0, out=similarity)
+
+
+def qrs_onsets(ecg_leads: np.ndarray, r_peaks: np.ndarray, search: int,
+               fraction: float = 0.2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    QRS onset of every beat in every lead, from the slope before each R-peak
+
+    The onset is the last sample before the steepest slope within `search`
+    samples ahead of the R-peak where the absolute slope is still below
+    `fraction` of that maximum.
+
+    Args:
+        ecg_leads: (n_leads, n_samples) filtered ECG (or a 1-D signal)
+        r_peaks: R-peak sample indices shared by all leads
+        search: Samples searched before each R-peak
+        fraction: Slope fraction marking the onset
+
+    Returns:
+        (n_leads, n_beats) onset lead time before the R-peak in samples, and
+        the R-peaks of the beats kept (beats too close to the start dropped)
+    """
+    leads = np.atleast_2d(np.asarray(ecg_leads, dtype=np.float64))
+    r_peaks = np.asarray(r_peaks, dtype=np.int64)
+    slope = np.abs(np.diff(leads, axis=-1, prepend=leads[:, :1]))
+    kept = r_peaks[(r_peaks >= search) & (r_peaks < leads.shape[-1])]
+    if len(kept) == 0:
+        return np.empty((len(leads), 0)), kept
+
+    # (n_leads, n_beats, search + 1) windows ending at each R-peak
+    windows = sliding_window_view(slope, search + 1, axis=-1)[:, kept - search]
+    steepest = np.argmax(windows, axis=-1)
+    threshold = fraction * np.take_along_axis(windows, steepest[..., None], axis=-1)
+    position = np.arange(search + 1)
+    quiet = (windows < threshold) & (position < steepest[..., None])
+    # Last quiet sample; beats without one start at the search edge
+    last_quiet = search - np.argmax(quiet[..., ::-1], axis=-1)
+    onsets = np.where(quiet.any(axis=-1), last_quiet, 0)
+    return search - onsets, kept
@@ -0,0 +1,69 @@
+"""
+ECG Chunk Iteration
+Fixed-length chunks with overlapping margins from arrays, memmaps or sample iterators
+"""
+
+import numpy as np
+from typing import Iterable, Iterator, Tuple, Union
+
+Source = Union[np.ndarray, Iterable[np.ndarray]]
+
+
+def overlapping_chunks(source: Source, chunk: int, margin: int) -> Iterator[Tuple[int, np.ndarray, int]]:
+    """
+    Walk a signal in chunks, each with up to `margin` neighbouring samples on both sides
+
+    Arrays (including np.memmap) are sliced, so only one block is read at a
+    time; any other iterable is consumed piece by piece and buffered just
+    far enough to supply the trailing margin.
+
+    Args:
+        source: 1-D array/memmap, or an iterable of 1-D sample arrays
+        chunk: Core samples per chunk
+        margin: Context samples on each side (filter warm-up)
+
+    Yields:
+        (start, block, offset): block[offset:offset + chunk] is the core
+        chunk beginning at sample `start` (shorter at the end of the signal)
+    """
+    if chunk < 1:
+        raise ValueError("chunk must be positive")
+
+    if hasattr(source, 'shape'):
+        n = source.shape[0]
+        for start in range(0, n, chunk):
+            lo, hi = max(0, start - margin), min(n, start + chunk + margin)
+            yield start, np.asarray(source[lo:hi], dtype=np.float64), start - lo
+        return
+
+    buffer = np.zeros(0)
+    buffer_start = 0
+    # Pieces received since the last join, and the buffered length including them
+    pending, buffered = [], 0
+    start = 0
+    for piece in source:
+        piece = np.asarray(piece, dtype=np.float64).ravel()
+        pending.append(piece)
+        buffered += len(piece)
+        if buffer_start + buffered < start + chunk + margin:
+            continue
+
+        # One copy per emitted chunk, not per piece
+        buffer = np.concatenate([buffer] + pending)
+        pending = []
+        while buffer_start + len(buffer) >= start + chunk + margin:
+            lo = max(buffer_start, start - margin)
+            yield start, buffer[lo - buffer_start:start + chunk + margin - buffer_start], start - lo
+            start += chunk
+            # Keep only what the next chunk's leading margin needs
+            drop = start - margin - buffer_start
+            if drop > 0:
+                buffer = buffer[drop:]
+                buffer_start += drop
+        buffered = len(buffer)
+
+    buffer = np.concatenate([buffer] + pending)
+    while start < buffer_start + len(buffer):
+        lo = max(buffer_start, start - margin)
+        yield start, buffer[lo - buffer_start:start + chunk + margin - buffer_start], start - lo
+        start += chunk
@@ -0,0 +1,483 @@
+"""
+ECG Signal Quality Assessment Tool
+Evaluates ECG signal quality using multiple metrics
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import signal, stats
+import pandas as pd
+from typing import Dict, Tuple, List, Union
+
+try:
+    from .analysis_context import SignalContext
+    from .filter_bank import zero_phase_filter
+    from .result_cache import ResultCache, cached_analysis
+    from .segments import merge_segments, run_counts
+    from .windowed import moving_moment, window_snr_db
+except ImportError:  # executed as a standalone script
+    from analysis_context import SignalContext
+    from filter_bank import zero_phase_filter
+    from result_cache import ResultCache, cached_analysis
+    from segments import merge_segments, run_counts
+    from windowed import moving_moment, window_snr_db
+
+# Upper bound on window samples whose spectra are held in memory at once
+WINDOW_BLOCK_SIZE = 1 << 22
+
+# Record of assess_windows (compact: one per window)
+WINDOW_QUALITY_DTYPE = np.dtype([
+    ('start', np.int64), ('end', np.int64), ('snr_db', np.float32),
+    ('baseline_wander', np.float32), ('powerline_ratio', np.float32),
+    ('clipping_fraction', np.float32), ('missing_fraction', np.float32),
+    ('flatline_fraction', np.float32), ('score', np.float32), ('usable', bool)
+])
+
+class ECGSignalQualityAssessor:
+    """Comprehensive ECG signal quality assessment"""
+    
+    # Bumped whenever a change alters results, invalidating cached entries
+    CACHE_VERSION = 1
+    
+    def __init__(self, sampling_rate: int = 500, cache: ResultCache = None):
+        """
+        Args:
+            sampling_rate: Sampling frequency in Hz
+            cache: Optional on-disk cache of assess_signal_quality results
+        """
+        self.sampling_rate = sampling_rate
+        self.cache = cache
+        self.quality_thresholds = {
+            'snr_db': 20,          # Minimum SNR in dB
+            'baseline_wander': 0.1, # Maximum baseline wander (mV)
+            'powerline_noise': 0.05, # Maximum powerline noise
+            'missing_data': 0.01,   # Maximum missing data percentage
+            'clipping': 0.02,       # Maximum clipping percentage
+            'saturation': 0.01      # Maximum saturation percentage
+        }
+    
+    @cached_analysis(settings=('quality_thresholds',))
+    def assess_signal_quality(self, ecg_signal: np.ndarray,
+                              context: SignalContext = None) -> Union[Dict, np.ndarray]:
+        """
+        Comprehensive signal quality assessment
+        
+        Every metric reduces along the time axis, so an (n_leads, n_samples)
+        array is assessed in one pass per metric (one batched filter and PSD
+        for all leads).
+        
+        Returns:
+            Dictionary of metrics for a 1-D signal; for multi-lead input a
+            structured array with one record of the same metrics per lead
+        """
+        ecg_signal = np.asarray(ecg_signal)
+        context = SignalContext.ensure(ecg_signal, self.sampling_rate, context)
+        quality_metrics = {}
+        
+        # Basic statistics
+        quality_metrics.update(self._calculate_basic_stats(ecg_signal, context))
+        
+        # Signal-to-Noise Ratio
+        quality_metrics.update(self._calculate_snr(ecg_signal))
+        
+        # Baseline wander assessment
+        quality_metrics.update(self._assess_baseline_wander(ecg_signal, context))
+        
+        # Powerline interference
+        quality_metrics.update(self._detect_powerline_noise(ecg_signal, context))
+        
+        # Missing data detection
+        quality_metrics.update(self._detect_missing_data(ecg_signal))
+        
+        # Clipping detection
+        quality_metrics.update(self._detect_clipping(ecg_signal))
+        
+        # Saturation detection
+        quality_metrics.update(self._detect_saturation(ecg_signal, context))
+        
+        # Overall quality score
+        quality_metrics['overall_quality_score'] = self._calculate_overall_score(quality_metrics)
+        
+        if ecg_signal.ndim == 1:
+            quality_metrics = {name: np.asarray(value).item() for name, value in quality_metrics.items()}
+            quality_metrics['quality_category'] = self._categorize_quality(quality_metrics['overall_quality_score'])
+            return quality_metrics
+        
+        quality_metrics['quality_category'] = np.array([
+            self._categorize_quality(score) for score in quality_metrics['overall_quality_score']
+        ], dtype='U12')
+        return _lead_records(quality_metrics)
+    
+    def assess_windows(self, ecg_signal: np.ndarray, window_s: float = 10.0, hop_s: float = 5.0,
+                       min_score: float = 60.0, context: SignalContext = None) -> np.ndarray:
+        """
+        Quality index per sliding window
+        
+        The band-pass and baseline filters run once over the whole signal;
+        window powers and clipping/flatline fractions come from O(n) moving
+        moments, baseline wander from strided window views and powerline
+        ratios from Welch spectra of blocks of windows (bounded by
+        WINDOW_BLOCK_SIZE samples). Windows are scored like
+        assess_signal_quality, so new data only needs its own windows scored.
+        NaN/inf samples count as missing data in their own windows and are
+        bridged by linear interpolation before any filtering.
+        
+        Args:
+            ecg_signal: ECG signal, or (n_leads, n_samples) leads
+            window_s: Window length in seconds
+            hop_s: Window step in seconds
+            min_score: Lowest score of a usable window (60 = FAIR)
+            context: Analysis context of ecg_signal shared with other tools
+            
+        Returns:
+            WINDOW_QUALITY_DTYPE records, one per window (n_leads x n_windows
+            for multi-lead input), with [start, end) sample ranges
+        """
+        ecg_signal = np.asarray(ecg_signal, dtype=np.float64)
+        context = SignalContext.ensure(ecg_signal, self.sampling_rate, context)
+        window = int(window_s * self.sampling_rate)
+        hop = max(1, int(hop_s * self.sampling_rate))
+        n_windows = (ecg_signal.shape[-1] - window) // hop + 1 if ecg_signal.shape[-1] >= window > 0 else 0
+        quality = np.zeros(ecg_signal.shape[:-1] + (n_windows,), dtype=WINDOW_QUALITY_DTYPE)
+        if n_windows == 0:
+            return quality
+        
+        quality['start'] = np.arange(n_windows) * hop
+        quality['end'] = quality['start'] + window
+        
+        # Invalid samples would otherwise spread through the filters and the
+        # cumulative sums into every window
+        invalid = ~np.isfinite(ecg_signal)
+        quality['missing_fraction'] = moving_moment(invalid, window)[..., ::hop]
+        if invalid.any():
+            ecg_signal = _bridge_invalid(ecg_signal, invalid)
+            baseline = self._lowpass_baseline(ecg_signal)
+        else:
+            baseline = context.cached('baseline_lowpass', lambda: self._lowpass_baseline(ecg_signal))
+        
+        # SNR from windowed powers of the band-passed signal and its residual
+        ecg_filtered = zero_phase_filter(ecg_signal, self.sampling_rate, (0.5, 40.0), 3)
+        # (noise-free windows capped at 100 dB)
+        snr = window_snr_db(ecg_filtered, ecg_signal - ecg_filtered, window)[..., ::hop]
+        quality['snr_db'] = np.minimum(snr, 100.0)
+        
+        # Clipping (outside +-5 mV) and flatline (unchanged samples) fractions
+        quality['clipping_fraction'] = moving_moment(np.abs(ecg_signal) > 5.0, window)[..., ::hop]
+        flat = np.abs(np.diff(ecg_signal, axis=-1)) < 1e-10
+        quality['flatline_fraction'] = moving_moment(flat, window - 1)[..., ::hop] if window > 1 else 0
+        
+        baseline_windows = sliding_window_view(baseline, window, axis=-1)[..., ::hop, :]
+        windows = sliding_window_view(ecg_signal, window, axis=-1)[..., ::hop, :]
+        nperseg = min(1024, window)
+        block = max(1, WINDOW_BLOCK_SIZE // window)
+        for first in range(0, n_windows, block):
+            span = slice(first, first + block)
+            wander = baseline_windows[..., span, :]
+            quality['baseline_wander'][..., span] = np.max(
+                np.abs(wander - np.mean(wander, axis=-1, keepdims=True)), axis=-1
+            )
+            
+            frequencies, power_spectrum = signal.welch(windows[..., span, :], fs=self.sampling_rate,
+                                                       nperseg=nperseg, axis=-1)
+            powerline = sum(power_spectrum[..., np.argmin(np.abs(frequencies - freq))] for freq in (50, 60))
+            total_power = np.sum(power_spectrum, axis=-1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                quality['powerline_ratio'][..., span] = np.where(total_power > 0, powerline / total_power, 0.0)
+        
+        quality['score'] = self._calculate_overall_score({
+            'snr_adequate': quality['snr_db'] >= self.quality_thresholds['snr_db'],
+            'baseline_wander_acceptable': quality['baseline_wander'] <= self.quality_thresholds['baseline_wander'],
+            'powerline_interference': quality['powerline_ratio'] > self.quality_thresholds['powerline_noise'],
+            'has_missing_data': (quality['missing_fraction'] + quality['flatline_fraction'] >
+                                 self.quality_thresholds['missing_data']),
+            'has_clipping': quality['clipping_fraction'] > self.quality_thresholds['clipping'],
+        })
+        quality['usable'] = quality['score'] >= min_score
+        return quality
+    
+    def usable_segments(self, window_quality: np.ndarray) -> np.ndarray:
+        """
+        Sample ranges covered by usable windows of one lead
+        
+        Returns:
+            (n_segments, 2) [start, end) ranges, overlapping windows merged
+        """
+        usable = window_quality[window_quality['usable']]
+        merged, _ = merge_segments(np.column_stack((usable['start'], usable['end'])))
+        return merged
+    
+    def _calculate_basic_stats(self, ecg_signal: np.ndarray, context: SignalContext = None) -> Dict:
+        """Calculate basic signal statistics"""
+        context = SignalContext.ensure(ecg_signal, self.sampling_rate, context)
+        stats_dict = {
+            'mean': context.mean(),
+            'std': context.std(),
+            'min': np.min(ecg_signal, axis=-1),
+            'max': np.max(ecg_signal, axis=-1),
+            'range': np.ptp(ecg_signal, axis=-1),
+            'rms': np.sqrt(context.power()),
+            'skewness': stats.skew(ecg_signal, axis=-1),
+            'kurtosis': stats.kurtosis(ecg_signal, axis=-1)
+        }
+        return stats_dict
+    
+    def _calculate_snr(self, ecg_signal: np.ndarray) -> Dict:
+        """Calculate Signal-to-Noise Ratio"""
+        # Bandpass filter to isolate ECG frequency band
+        ecg_filtered = zero_phase_filter(ecg_signal, self.sampling_rate, (0.5, 40.0), 3)
+        
+        # Noise is the difference between original and filtered
+        noise = ecg_signal - ecg_filtered
+        
+        # Calculate power
+        signal_power = np.mean(ecg_filtered ** 2, axis=-1)
+        noise_power = np.mean(noise ** 2, axis=-1)
+        
+        # Avoid division by zero (very high SNR)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            snr_db = np.where(noise_power == 0, 100.0, 10 * np.log10(signal_power / noise_power))
+        
+        return {
+            'snr_db': snr_db,
+            'signal_power': signal_power,
+            'noise_power': noise_power,
+            'snr_adequate': snr_db >= self.quality_thresholds['snr_db']
+        }
+    
+    def _assess_baseline_wander(self, ecg_signal: np.ndarray, context: SignalContext = None) -> Dict:
+        """Assess baseline wander using low-frequency components"""
+        context = SignalContext.ensure(ecg_signal, self.sampling_rate, context)
+        baseline = context.cached('baseline_lowpass', lambda: self._lowpass_baseline(ecg_signal))
+        
+        # Calculate wander metrics
+        wander_amplitude = np.max(np.abs(baseline - np.mean(baseline, axis=-1, keepdims=True)), axis=-1)
+        wander_frequency = self._estimate_dominant_frequency(baseline, max_freq=2)
+        
+        return {
+            'baseline_wander_amplitude': wander_amplitude,
+            'baseline_wander_frequency': wander_frequency,
+            'baseline_wander_acceptable': wander_amplitude <= self.quality_thresholds['baseline_wander']
+        }
+    
+    def _lowpass_baseline(self, ecg_signal: np.ndarray) -> np.ndarray:
+        """Low-pass (0.5 Hz) baseline estimate"""
+        return zero_phase_filter(ecg_signal, self.sampling_rate, 0.5, 2, btype='low')
+    
+    def _detect_powerline_noise(self, ecg_signal: np.ndarray, context: SignalContext = None) -> Dict:
+        """Detect powerline interference (50/60 Hz)"""
+        context = SignalContext.ensure(ecg_signal, self.sampling_rate, context)
+        
+        # Compute power spectrum
+        frequencies, power_spectrum = context.welch(nperseg=1024)
+        
+        # Check for 50Hz and 60Hz peaks
+        freq_50_idx = np.argmin(np.abs(frequencies - 50))
+        freq_60_idx = np.argmin(np.abs(frequencies - 60))
+        
+        # Calculate powerline noise ratio
+        total_power = np.sum(power_spectrum, axis=-1)
+        powerline_power = power_spectrum[..., freq_50_idx] + power_spectrum[..., freq_60_idx]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            powerline_ratio = np.where(total_power > 0, powerline_power / total_power, 0.0)
+        
+        return {
+            'powerline_noise_50hz': power_spectrum[..., freq_50_idx],
+            'powerline_noise_60hz': power_spectrum[..., freq_60_idx],
+            'powerline_noise_ratio': powerline_ratio,
+            'powerline_interference': powerline_ratio > self.quality_thresholds['powerline_noise']
+        }
+    
+    def _detect_missing_data(self, ecg_signal: np.ndarray) -> Dict:
+        """Detect missing or invalid data points"""
+        # Check for NaN or infinite values
+        nan_count = np.sum(np.isnan(ecg_signal), axis=-1)
+        inf_count = np.sum(np.isinf(ecg_signal), axis=-1)
+        
+        # Check for flatline segments
+        diff_signal = np.diff(ecg_signal, axis=-1)
+        # Runs of at least two unchanged differences
+        flatline_segments = run_counts(np.abs(diff_signal) < 1e-10, min_length=2)
+        
+        missing_percentage = (nan_count + inf_count) / ecg_signal.shape[-1]
+        
+        return {
+            'nan_count': nan_count,
+            'inf_count': inf_count,
+            'flatline_segments': flatline_segments,
+            'missing_data_percentage': missing_percentage,
+            'has_missing_data': missing_percentage > self.quality_thresholds['missing_data']
+        }
+    
+    def _detect_clipping(self, ecg_signal: np.ndarray) -> Dict:
+        """Detect signal clipping"""
+        # Assume normal ECG range is ±5 mV
+        normal_max = 5.0
+        normal_min = -5.0
+        
+        clipped_high = np.sum(ecg_signal > normal_max, axis=-1)
+        clipped_low = np.sum(ecg_signal < normal_min, axis=-1)
+        total_clipped = clipped_high + clipped_low
+        
+        clipping_percentage = total_clipped / ecg_signal.shape[-1]
+        
+        return {
+            'clipped_high_count': clipped_high,
+            'clipped_low_count': clipped_low,
+            'clipping_percentage': clipping_percentage,
+            'has_clipping': clipping_percentage > self.quality_thresholds['clipping']
+        }
+    
+    def _detect_saturation(self, ecg_signal: np.ndarray, context: SignalContext = None) -> Dict:
+        """Detect ADC saturation"""
+        context = SignalContext.ensure(ecg_signal, self.sampling_rate, context)
+        
+        # Check for maximum/minimum possible values (assuming 16-bit ADC)
+        adc_max = 32767  # For 16-bit signed
+        adc_min = -32768
+        
+        # Normalize signal first
+        normalized = (ecg_signal - np.expand_dims(context.mean(), -1)) / np.expand_dims(context.std(), -1)
+        
+        # Scale to ADC range
+        scaled = normalized * 1000  # Scale to typical ADC range
+        
+        saturated_high = np.sum(scaled >= adc_max * 0.95, axis=-1)
+        saturated_low = np.sum(scaled <= adc_min * 0.95, axis=-1)
+        total_saturated = saturated_high + saturated_low
+        
+        saturation_percentage = total_saturated / ecg_signal.shape[-1]
+        
+        return {
+            'saturation_high_count': saturated_high,
+            'saturation_low_count': saturated_low,
+            'saturation_percentage': saturation_percentage,
+            'has_saturation': saturation_percentage > self.quality_thresholds['saturation']
+        }
+    
+    def _estimate_dominant_frequency(self, signal_data: np.ndarray, max_freq: float = 10) -> float:
+        """Estimate dominant frequency using FFT (per lead for multi-lead input)"""
+        n = signal_data.shape[-1]
+        frequencies = np.fft.rfftfreq(n, d=1/self.sampling_rate)
+        
+        # Only consider frequencies up to max_freq
+        valid = int(np.sum(frequencies <= max_freq))
+        if valid == 0:
+            return np.zeros(signal_data.shape[:-1])
+        
+        fft_values = np.abs(np.fft.rfft(signal_data, axis=-1))
+        return frequencies[np.argmax(fft_values[..., :valid], axis=-1)]
+    
+    def _calculate_overall_score(self, metrics: Dict) -> float:
+        """Calculate overall quality score (0-100), elementwise over leads"""
+        score = 100.0
+        
+        # Deductions based on quality issues
+        score = score - 20 * ~np.asarray(metrics.get('snr_adequate', True), dtype=bool)
+        score = score - 15 * ~np.asarray(metrics.get('baseline_wander_acceptable', True), dtype=bool)
+        score = score - 10 * np.asarray(metrics.get('powerline_interference', False), dtype=bool)
+        score = score - 20 * np.asarray(metrics.get('has_missing_data', False), dtype=bool)
+        score = score - 15 * np.asarray(metrics.get('has_clipping', False), dtype=bool)
+        score = score - 20 * np.asarray(metrics.get('has_saturation', False), dtype=bool)
+        
+        return np.maximum(0.0, score)
+    
+    def _categorize_quality(self, score: float) -> str:
+        """Categorize signal quality based on score"""
+        if score >= 90:
+            return "EXCELLENT"
+        elif score >= 75:
+            return "GOOD"
+        elif score >= 60:
+            return "FAIR"
+        elif score >= 40:
+            return "POOR"
+        else:
+            return "UNACCEPTABLE"
+    
+    def generate_quality_report(self, metrics: Dict) -> str:
+        """Generate comprehensive quality report"""
+        report = []
+        report.append("=" * 70)
+        report.append("ECG SIGNAL QUALITY ASSESSMENT REPORT")
+        report.append("=" * 70)
+        report.append(f"Overall Quality: {metrics['quality_category']}")
+        report.append(f"Quality Score: {metrics['overall_quality_score']:.1f}/100")
+        report.append("")
+        report.append("Detailed Metrics:")
+        report.append(f"  SNR: {metrics.get('snr_db', 0):.1f} dB "
+                     f"{'(Adequate)' if metrics.get('snr_adequate', False) else '(Inadequate)'}")
+        report.append(f"  Baseline Wander: {metrics.get('baseline_wander_amplitude', 0):.3f} mV "
+                     f"{'(Acceptable)' if metrics.get('baseline_wander_acceptable', False) else '(Excessive)'}")
+        report.append(f"  Powerline Noise: {metrics.get('powerline_noise_ratio', 0):.3%} "
+                     f"{'(Acceptable)' if not metrics.get('powerline_interference', False) else '(Excessive)'}")
+        report.append(f"  Missing Data: {metrics.get('missing_data_percentage', 0):.3%} "
+                     f"{'(Acceptable)' if not metrics.get('has_missing_data', False) else '(Excessive)'}")
+        report.append(f"  Clipping: {metrics.get('clipping_percentage', 0):.3%} "
+                     f"{'(Acceptable)' if not metrics.get('has_clipping', False) else '(Excessive)'}")
+        report.append(f"  Saturation: {metrics.get('saturation_percentage', 0):.3%} "
+                     f"{'(Acceptable)' if not metrics.get('has_saturation', False) else '(Excessive)'}")
+        report.append("")
+        report.append("Recommendations:")
+        
+        recommendations = []
+        if metrics['overall_quality_score'] < 60:
+            recommendations.append("Signal quality is insufficient for clinical analysis.")
+            recommendations.append("Consider re-recording with proper electrode placement.")
+        
+        if metrics.get('powerline_interference', False):
+            recommendations.append("Powerline interference detected. Check grounding.")
+        
+        if metrics.get('has_missing_data', False):
+            recommendations.append("Missing data detected. Check electrode connections.")
+        
+        if recommendations:
+            for i, rec in enumerate(recommendations, 1):
+                report.append(f"  {i}. {rec}")
+        else:
+            report.append("  Signal quality is acceptable for clinical analysis.")
+        
+        report.append("=" * 70)
+        return "\n".join(report)
+
+def _bridge_invalid(ecg_signal: np.ndarray, invalid: np.ndarray) -> np.ndarray:
+    """Copy of the signal with invalid samples interpolated from each lead's valid ones (0 if none)"""
+    bridged = ecg_signal.copy()
+    positions = np.arange(ecg_signal.shape[-1])
+    for lead, bad in zip(bridged.reshape(-1, len(positions)), invalid.reshape(-1, len(positions))):
+        if bad.all():
+            lead[:] = 0.0
+        elif bad.any():
+            lead[bad] = np.interp(positions[bad], positions[~bad], lead[~bad])
+    return bridged
+
+def _lead_records(metrics: Dict) -> np.ndarray:
+    """Pack per-lead metric arrays into one structured record per lead"""
+    columns = {name: np.asarray(value) for name, value in metrics.items()}
+    n_leads = max(len(value) for value in columns.values() if value.ndim)
+    records = np.empty(n_leads, dtype=[(name, value.dtype) for name, value in columns.items()])
+    for name, value in columns.items():
+        records[name] = value
+    return records
+
+def main():
+    """Example usage of ECG Signal Quality Assessor"""
+    print("Initializing ECG Signal Quality Assessor...")
+    assessor = ECGSignalQualityAssessor(sampling_rate=500)
+    
+    # Generate synthetic ECG for testing
+    t = np.linspace(0, 10, 5000)
+    clean_ecg = np.sin(2 * np.pi * 1 * t) + 0.5 * np.sin(2 * np.pi * 5 * t)
+    
+    # Add some noise and artifacts
+    noisy_ecg = clean_ecg + 0.1 * np.random.randn(len(t))  # Gaussian noise
+    noisy_ecg += 0.05 * np.sin(2 * np.pi * 50 * t)  # Powerline noise
+    noisy_ecg[:100] = 0  # Missing data at start
+    
+    print("Assessing signal quality...")
+    quality_metrics = assessor.assess_signal_quality(noisy_ecg)
+    
+    report = assessor.generate_quality_report(quality_metrics)
+    print(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+ECG Filter Bank
+Cached Butterworth SOS designs shared by the ECG analysis tools
+"""
+
+import numpy as np
+from functools import lru_cache
+from scipy import signal
+from typing import Dict, Optional, Tuple, Union
+
+Band = Union[float, Tuple[float, float]]
+
+
+def _normalize_band(band: Band) -> Union[float, Tuple[float, float]]:
+    """Hashable cache key for a cutoff or (low, high) pair"""
+    if np.ndim(band) == 0:
+        return float(band)
+    low, high = band
+    return (float(low), float(high))
+
+
+@lru_cache(maxsize=128)
+def _design(sampling_rate: float, band: Band, order: int, btype: str) -> np.ndarray:
+    return signal.butter(order, band, btype=btype, output='sos', fs=sampling_rate)
+
+
+def design_sos(sampling_rate: float, band: Band, order: int, btype: str = None) -> np.ndarray:
+    """
+    Butterworth design in second-order sections, cached per (sampling_rate, band, order, btype)
+
+    Args:
+        sampling_rate: Sampling frequency in Hz
+        band: Cutoff in Hz, or (low, high) in Hz for band filters
+        order: Filter order
+        btype: 'low', 'high', 'band' or 'bandstop' (default: 'band' for pairs)
+
+    Returns:
+        SOS array shared by every caller (do not modify in place)
+    """
+    band = _normalize_band(band)
+    if btype is None:
+        if not isinstance(band, tuple):
+            raise ValueError("btype is required for a single cutoff")
+        btype = 'band'
+    return _design(float(sampling_rate), band, int(order), btype)
+
+
+def zero_phase_filter(x: np.ndarray, sampling_rate: float, band: Band, order: int,
+                      btype: str = None, axis: int = -1) -> np.ndarray:
+    """
+    Forward-backward (zero-phase) filtering with a cached SOS design
+
+    Args:
+        x: Signal, or a 2-D batch of equal-length signals
+        sampling_rate: Sampling frequency in Hz
+        band: Cutoff in Hz, or (low, high) in Hz for band filters
+        order: Filter order
+        btype: 'low', 'high', 'band' or 'bandstop' (default: 'band' for pairs)
+        axis: Time axis (a whole batch is filtered in one call)
+
+    Returns:
+        Filtered array of the same shape as x
+    """
+    return signal.sosfiltfilt(design_sos(sampling_rate, band, order, btype), x, axis=axis)
+
+
+def resolve_band(sampling_rate: float, band: Band, btype: str = None) -> Optional[Tuple[Band, str]]:
+    """
+    Fit a band to what the sampling rate can represent
+
+    An upper edge at or above Nyquist turns a band-pass into a high-pass and a
+    low-pass into an all-pass ('none'); a band starting at or above Nyquist
+    has no content and resolves to None. A zero lower edge means low-pass.
+
+    Returns:
+        (band, btype) ready for design_sos, or None
+    """
+    nyquist = sampling_rate / 2
+    band = _normalize_band(band)
+    if isinstance(band, tuple):
+        low, high = band
+        if low >= nyquist:
+            return None
+        if low <= 0:
+            return (high, 'low') if high < nyquist else (high, 'none')
+        return (band, btype or 'band') if high < nyquist else (low, 'high')
+    if btype is None:
+        raise ValueError("btype is required for a single cutoff")
+    if band < nyquist:
+        return band, btype
+    return None if btype == 'high' else (band, 'none')
+
+
+def default_padlen(sos: np.ndarray) -> int:
+    """Edge padding sosfiltfilt uses for `sos` when padlen is not given"""
+    taps = 2 * len(sos) + 1 - min(np.sum(sos[:, 2] == 0), np.sum(sos[:, 5] == 0))
+    return 3 * int(taps)
+
+
+class FilterBank:
+    """
+    Zero-phase decomposition of one signal into several Butterworth bands
+
+    The odd edge extension is built once at the longest padding any band
+    needs; each band's forward-backward pass runs over its own slice of it,
+    so every band equals a plain sosfiltfilt with its default padding. Bands
+    the sampling rate cannot carry are listed in `skipped`.
+    """
+
+    def __init__(self, sampling_rate: float, bands: Dict[str, Tuple[Band, int, str]]):
+        """
+        Args:
+            sampling_rate: Sampling frequency in Hz
+            bands: name -> (band, order, btype) as for design_sos; btype may
+                be None for (low, high) pairs
+        """
+        self.sampling_rate = sampling_rate
+        self.sos = {}
+        self.padlens = {}
+        self.skipped = []
+        for name, (band, order, btype) in bands.items():
+            resolved = resolve_band(sampling_rate, band, btype)
+            if resolved is None:
+                self.skipped.append(name)
+            else:
+                band, btype = resolved
+                self.sos[name] = None if btype == 'none' else design_sos(sampling_rate, band, order, btype)
+                if self.sos[name] is not None:
+                    self.padlens[name] = default_padlen(self.sos[name])
+
+        # Extension shared by all bands, long enough for the longest padding
+        self.padding = max(self.padlens.values(), default=0)
+
+    def decompose(self, x: np.ndarray, axis: int = -1) -> Dict[str, np.ndarray]:
+        """
+        Filter x into every available band
+
+        Args:
+            x: Signal, or a batch of equal-length signals
+            axis: Time axis
+
+        Returns:
+            name -> band-limited array of the same shape as x
+        """
+        x = np.moveaxis(np.asarray(x, dtype=np.float64), axis, -1)
+        n = x.shape[-1]
+        pad = min(self.padding, n - 1)
+        extended = x
+        if pad > 0:
+            # Odd extension (point reflection about each end sample)
+            extended = np.concatenate((2 * x[..., :1] - x[..., pad:0:-1], x,
+                                       2 * x[..., -1:] - x[..., -2:-pad - 2:-1]), axis=-1)
+
+        bands = {}
+        for name, sos in self.sos.items():
+            if sos is None:
+                bands[name] = np.moveaxis(x.copy(), -1, axis)
+                continue
+            # The innermost samples of the shared extension are this band's own
+            band_pad = min(self.padlens[name], pad)
+            padded = extended[..., pad - band_pad:pad + n + band_pad]
+            zi = signal.sosfilt_zi(sos).reshape((len(sos),) + (1,) * (x.ndim - 1) + (2,))
+            forward, _ = signal.sosfilt(sos, padded, zi=zi * padded[..., :1])
+            backward, _ = signal.sosfilt(sos, forward[..., ::-1], zi=zi * forward[..., -1:])
+            filtered = backward[..., ::-1]
+            bands[name] = np.moveaxis(filtered[..., band_pad:band_pad + n], -1, axis)
+        return bands
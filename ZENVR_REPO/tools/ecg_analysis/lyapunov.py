@@ -0,0 +1,121 @@
+"""
+ECG Largest Lyapunov Exponent
+Rosenstein divergence of nearest-neighbour trajectories in the delay embedding
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Tuple
+
+try:
+    from .phase_space import delay_embed
+except ImportError:  # executed as a standalone script
+    from phase_space import delay_embed
+
+
+def nearest_neighbours(embedded: np.ndarray, theiler: int, usable: int = None,
+                       tree: cKDTree = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nearest neighbour of each point outside a temporal exclusion window
+
+    Args:
+        embedded: (n, m) embedded vectors
+        theiler: Neighbours must be more than theiler samples away in time
+        usable: Only points [0, usable) are references or neighbours (default: all)
+        tree: KD-tree over embedded, if already built
+
+    Returns:
+        Tuple (neighbour index, distance) per reference point; -1 and inf
+        where no admissible neighbour exists
+    """
+    n = len(embedded) if usable is None else usable
+    if tree is None:
+        tree = cKDTree(embedded[:n])
+
+    neighbours = np.full(n, -1, dtype=np.int64)
+    distances = np.full(n, np.inf)
+    pending = np.arange(n)
+    # A window holds at most 2*theiler + 1 points, so that many + 1 always suffice
+    k, k_max = 8, min(2 * theiler + 2 + (tree.n - n), tree.n)
+    while len(pending):
+        k = min(k, k_max)
+        dist, idx = tree.query(embedded[pending], k=k)
+        dist, idx = dist.reshape(len(pending), -1), idx.reshape(len(pending), -1)
+        admissible = (np.abs(idx - pending[:, None]) > theiler) & (idx < n)
+        found = admissible.any(axis=1)
+        first = np.argmax(admissible, axis=1)
+        rows = np.flatnonzero(found)
+        neighbours[pending[rows]] = idx[rows, first[rows]]
+        distances[pending[rows]] = dist[rows, first[rows]]
+        if k == k_max:
+            break
+        pending = pending[~found]
+        k *= 4
+
+    return neighbours, distances
+
+
+def divergence_curve(embedded: np.ndarray, horizon: int, theiler: int,
+                     tree: cKDTree = None) -> np.ndarray:
+    """
+    Mean log distance between initially nearest trajectories
+
+    Args:
+        embedded: (n, m) embedded vectors
+        horizon: Number of steps to follow each pair
+        theiler: Temporal exclusion window for the neighbour search
+        tree: KD-tree over embedded, if already built
+
+    Returns:
+        <ln d_i(k)> for k = 0..horizon (NaN where no pair survives)
+    """
+    usable = len(embedded) - horizon
+    curve = np.full(horizon + 1, np.nan)
+    if usable < 2:
+        return curve
+
+    neighbours, _ = nearest_neighbours(embedded, theiler, usable, tree)
+    references = np.flatnonzero(neighbours >= 0)
+    neighbours = neighbours[references]
+
+    for k in range(horizon + 1):
+        separation = np.linalg.norm(embedded[references + k] - embedded[neighbours + k], axis=1)
+        separation = separation[separation > 0]
+        if len(separation):
+            curve[k] = np.mean(np.log(separation))
+    return curve
+
+
+def largest_lyapunov(signal: np.ndarray, m: int = 3, tau: int = 10, theiler: int = None,
+                     horizon: int = 20, fit_steps: int = None, sampling_rate: float = 1.0,
+                     embedded: np.ndarray = None, tree: cKDTree = None) -> float:
+    """
+    Rosenstein estimate of the largest Lyapunov exponent
+
+    Args:
+        signal: 1-D time series
+        m: Embedding dimension
+        tau: Delay in samples
+        theiler: Temporal exclusion window (default: (m-1)*tau)
+        horizon: Steps each neighbour pair is followed
+        fit_steps: Initial steps of the divergence curve fitted (default: horizon)
+        sampling_rate: Samples per time unit; the exponent is per time unit
+        embedded: Precomputed (n, m) embedding to use instead of signal
+        tree: KD-tree over embedded, if already built
+
+    Returns:
+        Slope of the divergence curve (0 when it cannot be estimated)
+    """
+    if embedded is None:
+        embedded = delay_embed(signal, m, tau)
+    if theiler is None:
+        theiler = (embedded.shape[1] - 1) * tau
+
+    curve = divergence_curve(embedded, horizon, theiler, tree)
+    steps = np.arange(len(curve))[:(fit_steps or horizon) + 1]
+    valid = ~np.isnan(curve[steps])
+    if np.sum(valid) < 2:
+        return 0.0
+
+    slope, _ = np.polyfit(steps[valid] / sampling_rate, curve[steps][valid], 1)
+    return float(slope)
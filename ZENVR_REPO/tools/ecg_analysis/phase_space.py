@@ -0,0 +1,31 @@
+"""
+ECG Phase Space Reconstruction
+Delay embedding shared by the nonlinear dynamics features
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def delay_embed(signal: np.ndarray, m: int = 1, tau: int = 1) -> np.ndarray:
+    """
+    Build the time-delay embedding of a scalar series
+
+    Args:
+        signal: 1-D time series
+        m: Embedding dimension
+        tau: Delay in samples
+
+    Returns:
+        Read-only (n - (m-1)*tau, m) view where row i is
+        [x[i], x[i+tau], ..., x[i+(m-1)*tau]]
+    """
+    if m < 1 or tau < 1:
+        raise ValueError("Embedding dimension and delay must be positive")
+
+    x = np.ascontiguousarray(signal, dtype=np.float64)
+    span = (m - 1) * tau + 1
+    if len(x) < span:
+        return np.empty((0, m))
+
+    return sliding_window_view(x, span)[:, ::tau]
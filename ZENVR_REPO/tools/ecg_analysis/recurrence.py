@@ -0,0 +1,302 @@
+"""
+ECG Recurrence Quantification Analysis
+Banded RQA that never materialises the dense n x n recurrence matrix
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict
+
+try:
+    from .phase_space import delay_embed
+except ImportError:  # executed as a standalone script
+    from phase_space import delay_embed
+
+# Recurrence-matrix cells evaluated per band (bounds peak memory)
+BAND_CELLS = 1 << 22
+
+
+def _line_lengths(mask: np.ndarray) -> np.ndarray:
+    """Lengths of all runs of True along the last axis of a 2-D mask"""
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1).ravel()
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return ends - starts
+
+
+def _within(embedded: np.ndarray, i: np.ndarray, j: np.ndarray, threshold: float) -> np.ndarray:
+    """Broadcasted Euclidean recurrence test between embedded points i and j"""
+    if embedded.shape[1] == 1:
+        return np.abs(embedded[i, 0] - embedded[j, 0]) < threshold
+
+    dist2 = np.zeros(np.broadcast_shapes(i.shape, j.shape))
+    for d in range(embedded.shape[1]):
+        dist2 += (embedded[i, d] - embedded[j, d]) ** 2
+    return dist2 < threshold ** 2
+
+
+def _within_bands(coords: np.ndarray, a: np.ndarray, b: np.ndarray, threshold: float) -> np.ndarray:
+    """Recurrence test between coordinate arrays a[d] and b[d] of shape (.., ..) per dimension"""
+    if len(coords) == 1:
+        return np.abs(a[0] - b[0]) < threshold
+
+    dist2 = np.square(a[0] - b[0])
+    for d in range(1, len(coords)):
+        dist2 += np.square(a[d] - b[d])
+    return dist2 < threshold ** 2
+
+
+def _line_metrics(histogram: np.ndarray, l_min: int):
+    """Fraction of points on lines >= l_min, their mean length and entropy"""
+    lengths = np.arange(len(histogram))
+    points = lengths * histogram
+    total_points = points.sum()
+    long_lines = histogram[l_min:]
+    long_points = points[l_min:].sum()
+
+    ratio = long_points / total_points if total_points > 0 else 0.0
+    mean_length = long_points / long_lines.sum() if long_lines.sum() > 0 else 0.0
+
+    if long_lines.sum() > 0:
+        p = long_lines[long_lines > 0] / long_lines.sum()
+        entropy = -np.sum(p * np.log(p))
+    else:
+        entropy = 0.0
+
+    return float(ratio), float(mean_length), float(entropy)
+
+
+def recurrence_quantification(signal: np.ndarray, threshold: float = None,
+                              m: int = 1, tau: int = 1,
+                              l_min: int = 2, v_min: int = 2,
+                              embedded: np.ndarray = None) -> Dict:
+    """
+    Recurrence quantification analysis in O(n) memory
+
+    Vertical line statistics are streamed over row bands and diagonal line
+    statistics over bands of diagonals; only the line-length histograms are
+    kept between bands. The line of identity is counted in the recurrence
+    rate but excluded from the diagonal-line measures.
+
+    Args:
+        signal: 1-D time series
+        threshold: Recurrence radius (default 0.2 * std of signal)
+        m: Embedding dimension
+        tau: Embedding delay in samples
+        l_min: Minimum diagonal line length for determinism/entropy
+        v_min: Minimum vertical line length for laminarity/trapping time
+        embedded: Precomputed (n, m) embedding to use instead of signal
+
+    Returns:
+        Dictionary with recurrence_rate, determinism, laminarity,
+        trapping_time and entropy
+    """
+    if threshold is None:
+        threshold = 0.2 * np.std(signal)
+    if embedded is None:
+        embedded = delay_embed(signal, m, tau)
+
+    n = len(embedded)
+    features = {
+        'recurrence_rate': 0.0,
+        'determinism': 0.0,
+        'laminarity': 0.0,
+        'trapping_time': 0.0,
+        'entropy': 0.0
+    }
+    if n < 2:
+        return features
+
+    band = max(1, BAND_CELLS // n)
+    # One contiguous array per coordinate, padded so that partners beyond
+    # the end are never recurrent; bands are then plain strided views
+    coords = np.full((embedded.shape[1], 2 * n), np.inf)
+    coords[:, :n] = embedded.T
+
+    # Row bands: recurrence count and vertical (== horizontal) lines
+    recurrent_points = 0
+    vertical_hist = np.zeros(n + 1, dtype=np.int64)
+    for r0 in range(0, n, band):
+        r1 = min(r0 + band, n)
+        mask = _within_bands(coords, coords[:, r0:r1, None], coords[:, None, :n], threshold)
+        recurrent_points += int(mask.sum())
+        vertical_hist += np.bincount(_line_lengths(mask), minlength=n + 1)
+
+    # Diagonal bands above the line of identity (mirror image is identical);
+    # row o of a band pairs point s with point s + k0 + o
+    diagonal_hist = np.zeros(n + 1, dtype=np.int64)
+    for k0 in range(1, n, band):
+        k1 = min(k0 + band, n)
+        partners = sliding_window_view(coords, n - k0, axis=1)[:, k0:k1]
+        mask = _within_bands(coords, coords[:, None, :n - k0], partners, threshold)
+        diagonal_hist += np.bincount(_line_lengths(mask), minlength=n + 1)
+
+    determinism, _, entropy = _line_metrics(diagonal_hist, l_min)
+    laminarity, trapping_time, _ = _line_metrics(vertical_hist, v_min)
+
+    features['recurrence_rate'] = recurrent_points / (n * n)
+    features['determinism'] = determinism
+    features['laminarity'] = laminarity
+    features['trapping_time'] = trapping_time
+    features['entropy'] = entropy
+
+    return features
+
+
+def _first_within(embedded: np.ndarray, origins: np.ndarray, starts: np.ndarray,
+                  threshold: float, horizon: np.ndarray, block: int, outside: bool = False) -> np.ndarray:
+    """
+    First index j >= start[i] (and <= horizon[i]) whose point lies within the
+    threshold of embedded[origins[i]] (or outside it when outside=True)
+
+    Candidates are scanned directly in (pending, block) windows; -1 marks
+    origins with no such index.
+    """
+    n = len(embedded)
+    found = np.full(len(origins), -1, dtype=np.int64)
+    pending = np.flatnonzero(starts <= horizon)
+    position = starts.copy()
+    offsets = np.arange(block)
+
+    while len(pending) > 0:
+        window = position[pending, None] + offsets[None, :]
+        valid = window <= horizon[pending, None]
+        hit = _within(embedded, origins[pending, None], np.minimum(window, n - 1), threshold)
+        hit = (~hit if outside else hit) & valid
+
+        any_hit = hit.any(axis=1)
+        found[pending[any_hit]] = window[any_hit, np.argmax(hit[any_hit], axis=1)]
+
+        pending = pending[~any_hit]
+        position[pending] += block
+        pending = pending[position[pending] <= horizon[pending]]
+
+    return found
+
+
+def first_return_times(signal: np.ndarray, threshold: float, m: int = 1, tau: int = 1,
+                       leave_ball: bool = False, t_max: int = None,
+                       embedded: np.ndarray = None, block: int = 64) -> np.ndarray:
+    """
+    First-return (recurrence) times of every embedded point
+
+    Returns are located with a per-block sorted index of the first embedding
+    coordinate: a vectorized binary search tells whether a block of `block`
+    samples can hold any point of the ball at all, so only candidate blocks
+    are compared point by point. Sorting dominates, giving O(n log n) for
+    signals whose returns are not pathologically far apart.
+
+    Args:
+        signal: 1-D time series
+        threshold: Recurrence radius (strict)
+        m: Embedding dimension
+        tau: Embedding delay in samples
+        leave_ball: Require the trajectory to leave the ball before it
+            returns (published RPDE definition) instead of taking the first
+            later point inside the ball
+        t_max: Longest recurrence time searched for (default: unbounded)
+        embedded: Precomputed (n, m) embedding to use instead of signal
+        block: Samples per index block
+
+    Returns:
+        Array of recurrence times for the points that recur
+    """
+    if embedded is None:
+        embedded = delay_embed(signal, m, tau)
+    n = len(embedded)
+    if n < 2:
+        return np.array([], dtype=np.int64)
+
+    origins = np.arange(n)
+    horizon = np.full(n, n - 1) if t_max is None else np.minimum(origins + t_max, n - 1)
+    starts = origins + 1
+
+    if leave_ball:
+        starts = _first_within(embedded, origins, starts, threshold, horizon, 8, outside=True)
+        recurring = starts >= 0
+        origins, starts, horizon = origins[recurring], starts[recurring], horizon[recurring]
+
+    # Per-block sorted first coordinate, padded with +inf
+    n_blocks = -(-n // block)
+    lead = np.full(n_blocks * block, np.inf)
+    lead[:n] = embedded[:, 0]
+    sorted_blocks = np.sort(lead.reshape(n_blocks, block), axis=1)
+    centre = embedded[origins, 0]
+
+    # Per-block bounding box of the remaining coordinates
+    padded = np.full((n_blocks * block, embedded.shape[1]), np.nan)
+    padded[:n] = embedded
+    padded = padded.reshape(n_blocks, block, -1)
+    box_min = np.nanmin(padded, axis=1)
+    box_max = np.nanmax(padded, axis=1)
+
+    # Resolve the first partial block directly, then walk block by block
+    first_block_end = (starts // block + 1) * block - 1
+    returns = _first_within(embedded, origins, starts, threshold,
+                            np.minimum(first_block_end, horizon), block)
+    pending = np.flatnonzero((returns < 0) & (first_block_end < horizon))
+    current = starts // block + 1
+
+    while len(pending) > 0:
+        blk = current[pending]
+
+        # Binary search for the first value above centre - threshold
+        lo = np.zeros(len(pending), dtype=np.int64)
+        hi = np.full(len(pending), block, dtype=np.int64)
+        lower = centre[pending] - threshold
+        while np.any(lo < hi):
+            mid = (lo + hi) // 2
+            above = sorted_blocks[blk, np.minimum(mid, block - 1)] > lower
+            active = lo < hi
+            hi = np.where(active & above, mid, hi)
+            lo = np.where(active & ~above, mid + 1, lo)
+        candidate = (lo < block) & (sorted_blocks[blk, np.minimum(lo, block - 1)] < centre[pending] + threshold)
+        points = embedded[origins[pending]]
+        candidate &= np.all((box_min[blk] - points < threshold) & (points - box_max[blk] < threshold), axis=1)
+
+        if np.any(candidate):
+            idx = pending[candidate]
+            block_start = current[idx] * block
+            returns[idx] = _first_within(embedded, origins[idx], block_start, threshold,
+                                         np.minimum(block_start + block - 1, horizon[idx]), block)
+
+        current[pending] += 1
+        pending = pending[(returns[pending] < 0) & (current[pending] * block <= horizon[pending])]
+
+    recurring = returns >= 0
+    return returns[recurring] - origins[recurring]
+
+
+def recurrence_period_density_entropy(signal: np.ndarray, threshold: float = None,
+                                      m: int = 1, tau: int = 1, leave_ball: bool = False,
+                                      t_max: int = None, normalize: bool = False,
+                                      embedded: np.ndarray = None) -> float:
+    """
+    Recurrence period density entropy
+
+    With normalize=False the entropy of the 'auto'-binned density histogram
+    of recurrence times is returned (the extractor's historical feature).
+    With normalize=True the recurrence-time density P(T), T = 1..T_max, is
+    used and the entropy is divided by ln(T_max) as in Little et al. (2007).
+    """
+    if threshold is None:
+        threshold = 0.1 * np.std(signal)
+
+    times = first_return_times(signal, threshold, m=m, tau=tau, leave_ball=leave_ball,
+                               t_max=t_max, embedded=embedded)
+    if len(times) < 2:
+        return 0.0
+
+    if normalize:
+        period_max = t_max if t_max is not None else int(times.max())
+        if period_max < 2:
+            return 0.0
+        density = np.bincount(times, minlength=period_max + 1)[1:period_max + 1] / len(times)
+        density = density[density > 0]
+        return float(-np.sum(density * np.log(density)) / np.log(period_max))
+
+    hist, _ = np.histogram(times, bins='auto', density=True)
+    hist = hist[hist > 0]
+    return float(-np.sum(hist * np.log(hist)))
@@ -0,0 +1,176 @@
+"""
+ECG Analysis Result Cache
+On-disk cache of analysis results keyed by signal content, settings and analyzer version
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+import numpy as np
+from typing import Callable, Dict, Hashable, Optional
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Separator of nested dictionary keys inside an .npz archive
+_PATH_SEPARATOR = '/'
+# Archive entry holding a result that is not a dictionary
+_RESULT_ENTRY = '__result__'
+
+
+def _digest(data: bytes) -> str:
+    """Fast content hash (xxh3 when available, else BLAKE2b)"""
+    if XXHASH_AVAILABLE:
+        return 'xxh3-' + xxhash.xxh3_128_hexdigest(data)
+    return 'b2-' + hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def fingerprint(value) -> str:
+    """Canonical text of a parameter value (arrays are hashed by content)"""
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        return f'array({array.dtype.str},{array.shape},{_digest(array.view(np.uint8).tobytes())})'
+    if isinstance(value, dict):
+        return '{' + ','.join(f'{fingerprint(k)}:{fingerprint(value[k])}' for k in sorted(value, key=repr)) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(fingerprint(v) for v in value) + ']'
+    return repr(value)
+
+
+def _flatten(result: Dict, prefix: str = '') -> Dict[str, np.ndarray]:
+    entries = {}
+    for name, value in result.items():
+        path = f'{prefix}{name}'
+        if isinstance(value, dict):
+            entries.update(_flatten(value, path + _PATH_SEPARATOR))
+        else:
+            entries[path] = np.asarray(value)
+    return entries
+
+
+def _unflatten(entries: Dict[str, np.ndarray]) -> Dict:
+    result = {}
+    for path, value in entries.items():
+        *parents, name = path.split(_PATH_SEPARATOR)
+        node = result
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        # 0-d entries were Python/NumPy scalars
+        node[name] = value.item() if value.ndim == 0 and value.dtype.names is None else value
+    return result
+
+
+class ResultCache:
+    """
+    Directory of compressed .npz results with least-recently-used eviction
+
+    Results are dictionaries (possibly nested) of scalars, strings and
+    arrays, or a single array. Entries are written atomically; a hit
+    refreshes the entry's modification time, and the oldest entries are
+    evicted once the directory grows beyond max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        """
+        Args:
+            directory: Cache directory (created if missing)
+            max_bytes: Size budget of all entries together
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, ecg_signal: np.ndarray, sampling_rate: float, analyzer: str, version: Hashable,
+            params: Dict = None) -> str:
+        """Entry name for a signal analysed by `analyzer` at `version` with `params`"""
+        signal = np.ascontiguousarray(ecg_signal)
+        header = fingerprint((analyzer, version, float(sampling_rate), signal.dtype.str, signal.shape, params or {}))
+        return _digest(header.encode() + signal.view(np.uint8).tobytes())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.npz')
+
+    def get(self, key: str) -> Optional[object]:
+        """Cached result, or None on a miss"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                entries = {name: archive[name] for name in archive.files}
+            os.utime(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        if _RESULT_ENTRY in entries:
+            return entries[_RESULT_ENTRY]
+        return _unflatten(entries)
+
+    def put(self, key: str, result) -> None:
+        """Store a result and evict least recently used entries beyond the budget"""
+        entries = _flatten(result) if isinstance(result, dict) else {_RESULT_ENTRY: np.asarray(result)}
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as handle:
+                np.savez_compressed(handle, **entries)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently used entries until the budget is met"""
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.npz')]
+        stats = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries))
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in stats:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                os.remove(entry.path)
+
+
+def cached_analysis(params: tuple = (), settings: tuple = ()) -> Callable:
+    """
+    Serve an analyzer method from the analyzer's `cache` (a ResultCache, or None)
+
+    The key covers the signal bytes, the analyzer's sampling rate and
+    CACHE_VERSION, the named call arguments and the named instance settings
+    (e.g. detection thresholds).
+    """
+    def decorate(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, ecg_signal, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            if cache is None:
+                return method(self, ecg_signal, *args, **kwargs)
+
+            bound = signature.bind(self, ecg_signal, *args, **kwargs)
+            bound.apply_defaults()
+            key_params = {name: bound.arguments[name] for name in params}
+            key_params.update({f'self.{name}': getattr(self, name) for name in settings})
+            key = cache.key(np.asarray(ecg_signal), self.sampling_rate,
+                            f'{type(self).__name__}.{method.__name__}', self.CACHE_VERSION, key_params)
+
+            result = cache.get(key)
+            if result is None:
+                result = method(self, ecg_signal, *args, **kwargs)
+                cache.put(key, result)
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,100 @@
+"""
+ECG Segment Runs
+Run-length grouping of sample indices and masks into (start, end) segments
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+def index_segments(indices: np.ndarray, max_gap: int = 1, min_length: int = 1) -> np.ndarray:
+    """
+    Group sorted sample indices into runs
+
+    Args:
+        indices: Ascending sample indices
+        max_gap: Neighbouring indices at most this far apart share a segment
+        min_length: Segments spanning fewer samples are dropped
+
+    Returns:
+        (n_segments, 2) int64 array of half-open [start, end) sample ranges
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    if len(indices) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    breaks = np.flatnonzero(np.diff(indices) > max_gap)
+    segments = np.empty((len(breaks) + 1, 2), dtype=np.int64)
+    segments[0, 0] = indices[0]
+    segments[1:, 0] = indices[breaks + 1]
+    segments[:-1, 1] = indices[breaks] + 1
+    segments[-1, 1] = indices[-1] + 1
+    if min_length > 1:
+        segments = segments[segments[:, 1] - segments[:, 0] >= min_length]
+    return segments
+
+
+def mask_segments(mask: np.ndarray, min_length: int = 1) -> np.ndarray:
+    """
+    Runs of True in a boolean mask, without materializing their indices
+
+    Returns:
+        (n_segments, 2) int64 array of half-open [start, end) sample ranges
+    """
+    edges = np.diff(np.asarray(mask, dtype=np.int8), prepend=0, append=0)
+    segments = np.column_stack((np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))).astype(np.int64)
+    if min_length > 1:
+        segments = segments[segments[:, 1] - segments[:, 0] >= min_length]
+    return segments
+
+
+def run_counts(mask: np.ndarray, min_length: int = 1):
+    """
+    Number of True runs of at least min_length along the last axis
+
+    Returns:
+        An int for a 1-D mask, else one count per row (e.g. per lead)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    rows = mask.reshape(-1, mask.shape[-1])
+    edges = np.diff(rows.astype(np.int8), prepend=0, append=0, axis=-1)
+    # Row-major order pairs every run's start with its end
+    start_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    counts = np.bincount(start_rows[ends - starts >= min_length], minlength=len(rows))
+    return int(counts[0]) if mask.ndim == 1 else counts.reshape(mask.shape[:-1])
+
+
+def segment_lengths(segments: np.ndarray) -> np.ndarray:
+    """Samples spanned by each segment"""
+    segments = np.asarray(segments, dtype=np.int64).reshape(-1, 2)
+    return segments[:, 1] - segments[:, 0]
+
+
+def merge_segments(segments: np.ndarray, max_gap: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge overlapping segments and segments at most max_gap samples apart
+
+    Args:
+        segments: (n_segments, 2) [start, end) ranges in any order
+        max_gap: Largest gap bridged (0 joins touching segments, -1 only overlapping ones)
+
+    Returns:
+        Merged (n_merged, 2) segments sorted by start, and the merged row each
+        input segment belongs to
+    """
+    segments = np.asarray(segments, dtype=np.int64).reshape(-1, 2)
+    if len(segments) == 0:
+        return segments.copy(), np.zeros(0, dtype=np.int64)
+
+    order = np.argsort(segments[:, 0], kind='stable')
+    starts, ends = segments[order, 0], segments[order, 1]
+    reach = np.maximum.accumulate(ends)
+    opens = np.concatenate(([True], starts[1:] > reach[:-1] + max_gap))
+    group = np.cumsum(opens) - 1
+
+    first = np.flatnonzero(opens)
+    merged = np.column_stack((starts[first], np.maximum.reduceat(ends, first)))
+    groups = np.empty(len(segments), dtype=np.int64)
+    groups[order] = group
+    return merged, groups
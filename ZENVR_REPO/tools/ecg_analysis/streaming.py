@@ -0,0 +1,296 @@
+"""
+ECG Streaming Feature Extraction
+Incremental filtering, R-peak detection and sliding-window feature snapshots
+"""
+
+import numpy as np
+from collections import deque
+from scipy import signal
+from typing import Dict, List
+
+try:
+    from .feature_extractor import ECGFeatureExtractor
+    from .filter_bank import design_sos
+except ImportError:  # executed as a standalone script
+    from feature_extractor import ECGFeatureExtractor
+    from filter_bank import design_sos
+
+
+class RunningStats:
+    """Welford/Chan running mean and variance supporting batch removal"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        n_b = len(values)
+        if n_b == 0:
+            return
+        mean_b = float(np.mean(values))
+        m2_b = float(np.sum((values - mean_b) ** 2))
+        n = self.count + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta ** 2 * self.count * n_b / n
+        self.count = n
+
+    def remove(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        n_b = len(values)
+        if n_b == 0:
+            return
+        n_a = self.count - n_b
+        if n_a <= 0:
+            self.__init__()
+            return
+        mean_b = float(np.mean(values))
+        m2_b = float(np.sum((values - mean_b) ** 2))
+        mean_a = (self.count * self.mean - n_b * mean_b) / n_a
+        delta = mean_b - mean_a
+        self.m2 = max(0.0, self.m2 - m2_b - delta ** 2 * n_a * n_b / self.count)
+        self.mean = mean_a
+        self.count = n_a
+
+    @property
+    def var(self) -> float:
+        """Population variance (like np.var)"""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.var))
+
+
+class _Ring:
+    """Fixed-capacity sample buffer"""
+
+    def __init__(self, capacity: int):
+        self.buffer = np.zeros(capacity)
+        self.size = 0
+        self.pos = 0
+
+    def extend(self, values: np.ndarray) -> np.ndarray:
+        """Append values and return the samples they pushed out"""
+        capacity = len(self.buffer)
+        n_new = len(values)
+        n_evicted = max(0, self.size + n_new - capacity)
+        evicted = self.values()[:n_evicted] if n_evicted <= self.size else np.concatenate(
+            (self.values(), values[:n_evicted - self.size])
+        )
+
+        values = values[-capacity:]
+        idx = (self.pos + np.arange(len(values))) % capacity
+        self.buffer[idx] = values
+        self.pos = (self.pos + len(values)) % capacity
+        self.size = min(capacity, self.size + n_new)
+        return evicted
+
+    def values(self) -> np.ndarray:
+        """Contents in arrival order"""
+        if self.size < len(self.buffer):
+            return self.buffer[self.pos - self.size:self.pos] if self.pos >= self.size else np.concatenate(
+                (self.buffer[self.pos - self.size:], self.buffer[:self.pos])
+            )
+        return np.concatenate((self.buffer[self.pos:], self.buffer[:self.pos]))
+
+
+class StreamingFeatureExtractor(ECGFeatureExtractor):
+    """
+    Feature extraction over an unbounded ECG stream
+
+    Chunks are band-passed causally (0.5-40 Hz, sosfilt state carried between
+    chunks), R-peaks are confirmed once the refractory period after them has
+    been seen, and signal/RR statistics are maintained incrementally over a
+    sliding window. A snapshot is emitted every hop without revisiting
+    earlier samples.
+    """
+
+    def __init__(self, sampling_rate: int = 500, window_s: float = 10.0, hop_s: float = 1.0,
+                 feature_groups: List[str] = ()):
+        """
+        Args:
+            sampling_rate: Sampling frequency in Hz
+            window_s: Snapshot window length in seconds
+            hop_s: Interval between snapshots in seconds
+            feature_groups: Batch feature groups additionally computed on each
+                window (bounded work per snapshot); empty for incremental
+                features only
+        """
+        super().__init__(sampling_rate)
+        self.window = int(window_s * sampling_rate)
+        self.hop = max(1, int(hop_s * sampling_rate))
+        self.snapshot_groups = self._resolve_feature_groups(list(feature_groups)) if feature_groups else []
+
+        self._sos = design_sos(sampling_rate, (0.5, 40.0), 3)
+        self._integration = int(0.15 * sampling_rate)
+        self._refractory = int(0.3 * sampling_rate)
+        self.reset()
+
+    def reset(self):
+        """Forget all stream state"""
+        self.n_samples = 0
+        self._zi = None
+        self._last_filtered = None
+        self._squared_tail = np.zeros(self._integration - 1)
+
+        self._peak_buffer = np.zeros(0)
+        self._peak_buffer_start = 0
+        self._chunk_maxima = deque()
+        self._last_peak = None
+        self._peaks = deque()
+
+        self._filtered = _Ring(self.window)
+        self._raw = _Ring(self.window) if self.snapshot_groups else None
+        self._window_stats = RunningStats()
+        self._since_refresh = 0
+        self.stream_stats = RunningStats()
+
+        self._rr = deque()
+        self._rr_stats = RunningStats()
+        self._diff_stats = RunningStats()
+        self._nn50 = 0
+
+        self._next_snapshot = self.window
+
+    def update(self, chunk: np.ndarray) -> List[Dict]:
+        """
+        Consume the next chunk of raw samples
+
+        Returns:
+            Snapshots whose window ended inside this chunk (possibly none)
+        """
+        chunk = np.asarray(chunk, dtype=np.float64).ravel()
+        snapshots = []
+        while len(chunk):
+            take = min(len(chunk), self._next_snapshot - self.n_samples)
+            self._process(chunk[:take])
+            chunk = chunk[take:]
+            if self.n_samples == self._next_snapshot:
+                snapshots.append(self.snapshot())
+                self._next_snapshot += self.hop
+        return snapshots
+
+    def _process(self, raw: np.ndarray):
+        # Causal band-pass, continuing the previous chunk's filter state
+        if self._zi is None:
+            self._zi = signal.sosfilt_zi(self._sos) * raw[0]
+        filtered, self._zi = signal.sosfilt(self._sos, raw, zi=self._zi)
+
+        start = self.n_samples
+        self.n_samples += len(raw)
+        self.stream_stats.add(filtered)
+
+        evicted = self._filtered.extend(filtered)
+        self._window_stats.add(filtered)
+        self._window_stats.remove(evicted)
+        self._since_refresh += len(filtered)
+        if self._since_refresh >= self.window:
+            # Re-anchor once per window so add/remove rounding cannot drift
+            self._window_stats = RunningStats()
+            self._window_stats.add(self._filtered.values())
+            self._since_refresh = 0
+        if self._raw is not None:
+            self._raw.extend(raw)
+
+        self._detect_peaks(filtered, start)
+        self._evict_rr(self.n_samples - self.window)
+
+    def _detect_peaks(self, filtered: np.ndarray, start: int):
+        """Derivative-energy peaks (as in _detect_r_peaks), confirmed incrementally"""
+        previous = self._last_filtered if self._last_filtered is not None else filtered[0]
+        self._last_filtered = filtered[-1]
+        squared = np.diff(filtered, prepend=previous) ** 2
+
+        # Causal moving-window integration; sample k summarizes [k - w + 1, k]
+        w = self._integration
+        integrated = np.convolve(np.concatenate((self._squared_tail, squared)), np.ones(w) / w, mode='valid')
+        self._squared_tail = np.concatenate((self._squared_tail, squared))[-(w - 1):] if w > 1 else self._squared_tail
+
+        # Threshold: half the largest integrated value within the window
+        self._chunk_maxima.append((start + len(squared), float(np.max(integrated))))
+        while self._chunk_maxima[0][0] <= self.n_samples - self.window:
+            self._chunk_maxima.popleft()
+        threshold = 0.5 * max(value for _, value in self._chunk_maxima)
+
+        self._peak_buffer = np.concatenate((self._peak_buffer, integrated))
+        end = self._peak_buffer_start + len(self._peak_buffer)
+        peaks, _ = signal.find_peaks(self._peak_buffer, height=threshold, distance=self._refractory)
+
+        for peak in peaks + self._peak_buffer_start:
+            # Final once no later sample within the refractory period can outrank it
+            if peak + self._refractory > end:
+                break
+            if self._last_peak is not None and peak - self._last_peak < self._refractory:
+                continue
+            self._add_peak(int(peak))
+
+        keep = 2 * self._refractory
+        if len(self._peak_buffer) > keep:
+            self._peak_buffer_start = end - keep
+            self._peak_buffer = self._peak_buffer[-keep:]
+
+    def _add_peak(self, peak: int):
+        # Report the centre of the integration window, like mode='same'
+        r_peak = peak - (self._integration - 1) // 2
+        if self._peaks:
+            rr = (r_peak - self._peaks[-1]) / self.sampling_rate * 1000
+            diff = rr - self._rr[-1][1] if self._rr else None
+            self._rr.append((self._peaks[-1], rr, diff))
+            self._rr_stats.add([rr])
+            if diff is not None:
+                self._diff_stats.add([diff])
+                self._nn50 += abs(diff) > 50
+        self._peaks.append(r_peak)
+        self._last_peak = peak
+
+    def _evict_rr(self, window_start: int):
+        while self._peaks and self._peaks[0] < window_start:
+            self._peaks.popleft()
+        # An RR interval leaves with the peak that opens it
+        while self._rr and self._rr[0][0] < window_start:
+            _, rr, diff = self._rr.popleft()
+            self._rr_stats.remove([rr])
+            if diff is not None:
+                self._drop_diff(diff)
+            if self._rr and self._rr[0][2] is not None:
+                # The new oldest interval's predecessor left the window
+                opening, rr_next, diff_next = self._rr.popleft()
+                self._drop_diff(diff_next)
+                self._rr.appendleft((opening, rr_next, None))
+
+    def _drop_diff(self, diff: float):
+        self._diff_stats.remove([diff])
+        self._nn50 -= abs(diff) > 50
+
+    def snapshot(self) -> Dict:
+        """Features of the current window"""
+        window_start = max(0, self.n_samples - self.window)
+        features = {
+            'window_start': window_start,
+            'window_end': self.n_samples,
+            'temporal_mean': float(self._window_stats.mean),
+            'temporal_std': self._window_stats.std,
+            'stream_mean': float(self.stream_stats.mean),
+            'stream_std': self.stream_stats.std,
+            'n_beats': len(self._peaks),
+        }
+
+        n_rr, n_diff = self._rr_stats.count, self._diff_stats.count
+        mean_rr = float(self._rr_stats.mean) if n_rr else 0.0
+        features['interval_mean_rr'] = mean_rr
+        features['interval_std_rr'] = self._rr_stats.std if n_rr else 0.0
+        features['heart_rate'] = 60000.0 / mean_rr if mean_rr > 0 else 0.0
+        features['interval_rmssd'] = float(np.sqrt(self._diff_stats.var + self._diff_stats.mean ** 2)) if n_diff else 0.0
+        features['interval_sdsd'] = self._diff_stats.std if n_diff else 0.0
+        features['interval_pnn50'] = float(self._nn50 / n_diff) if n_diff else 0.0
+
+        if self.snapshot_groups:
+            raw = self._raw.values()
+            r_peaks = np.array([p - window_start for p in self._peaks if p >= window_start], dtype=int)
+            window_features = self.extract_all_features(raw, r_peaks=r_peaks, feature_groups=self.snapshot_groups)
+            features.update({k: v for k, v in window_features.items() if k not in features})
+
+        return features
@@ -0,0 +1,53 @@
+"""
+ECG Windowed Statistics
+O(n) sliding-window moments over signals or batches of leads
+"""
+
+import numpy as np
+
+
+def moving_moment(x: np.ndarray, window: int, order: int = 1, axis: int = -1) -> np.ndarray:
+    """
+    Mean of x**order over every full window, from one cumulative sum
+
+    Args:
+        x: Signal, or an array of signals (e.g. n_leads x n_samples)
+        window: Window length in samples
+        order: Raw moment order (1 = mean, 2 = mean power)
+        axis: Time axis
+
+    Returns:
+        Array whose time axis has n - window + 1 entries; entry i covers
+        samples [i, i + window)
+    """
+    x = np.moveaxis(np.asarray(x, dtype=np.float64), axis, -1)
+    n = x.shape[-1]
+    window = int(window)
+    if window < 1:
+        raise ValueError("window must be positive")
+    if n < window:
+        return np.moveaxis(np.empty(x.shape[:-1] + (0,)), -1, axis)
+
+    powered = x if order == 1 else x ** order
+    cumulative = np.zeros(x.shape[:-1] + (n + 1,))
+    np.cumsum(powered, axis=-1, out=cumulative[..., 1:])
+    moments = (cumulative[..., window:] - cumulative[..., :-window]) / window
+    return np.moveaxis(moments, -1, axis)
+
+
+def moving_rms(x: np.ndarray, window: int, axis: int = -1) -> np.ndarray:
+    """Root mean square over every full window (see moving_moment)"""
+    return np.sqrt(np.maximum(moving_moment(x, window, 2, axis), 0.0))
+
+
+def window_snr_db(signal: np.ndarray, noise: np.ndarray, window: int, axis: int = -1) -> np.ndarray:
+    """
+    SNR in dB of every full window from the windowed powers of signal and noise
+
+    Windows without noise power get +inf.
+    """
+    signal_power = moving_moment(signal, window, 2, axis)
+    noise_power = moving_moment(noise, window, 2, axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        snr = 10 * np.log10(signal_power / noise_power)
+    return np.where(noise_power > 0, snr, np.inf)
@@ -0,0 +1,90 @@
+"""
+Analysis Context Tests
+"""
+import numpy as np
+import pytest
+
+from tools.data_processing.data_augmentation import generate_sample_ecg
+from tools.ecg_analysis.analysis_context import SignalContext
+from tools.ecg_analysis.artifact_detector import ECGArtifactDetector
+from tools.ecg_analysis.ecg_signal_quality import ECGSignalQualityAssessor
+from tools.ecg_analysis.feature_extractor import ECGFeatureExtractor
+
+
+@pytest.fixture
+def ecg():
+    np.random.seed(0)
+    return generate_sample_ecg(sampling_rate=500, duration=4.0)
+
+
+def test_statistics_are_cached_and_exact(ecg):
+    context = SignalContext(ecg, 500)
+
+    assert context.std() == np.std(ecg)
+    assert context.var() == np.var(ecg)
+    assert context.median() == np.median(ecg)
+
+    calls = []
+    context.cached('custom', lambda: calls.append(1) or 42)
+    context.cached('custom', lambda: calls.append(1) or 42)
+    assert calls == [1]
+
+
+def test_derived_context_is_memoized(ecg):
+    context = SignalContext(ecg, 500)
+
+    first = context.derive('scaled', lambda: 2 * ecg)
+    second = context.derive('scaled', lambda: 3 * ecg)
+
+    assert first is second
+    np.testing.assert_array_equal(first.signal, 2 * ecg)
+
+
+def test_context_must_match_signal(ecg):
+    with pytest.raises(ValueError):
+        SignalContext.ensure(ecg[:100], 500, SignalContext(ecg, 500))
+
+
+def test_tools_share_one_context(ecg):
+    context = SignalContext(ecg, 500)
+
+    ECGSignalQualityAssessor(500).assess_signal_quality(ecg, context=context)
+    psd = context.welch(1024)
+    baseline = context.cached('baseline_lowpass', lambda: None)
+
+    artifacts = ECGArtifactDetector(500).detect_artifacts(ecg, context=context)
+    ECGFeatureExtractor(500).extract_all_features(ecg, feature_groups=['spectral'], context=context)
+
+    assert context.welch(1024) is psd
+    assert context.cached('baseline_lowpass', lambda: None) is baseline
+    assert artifacts['baseline_wander']['amplitude'] == np.ptp(baseline)
+    assert 'filtered' in context
+
+
+def test_shared_baseline_does_not_depend_on_tool_order():
+    np.random.seed(0)
+    ecg = generate_sample_ecg(sampling_rate=500, duration=10.0) + 0.5
+    detector, assessor = ECGArtifactDetector(500), ECGSignalQualityAssessor(500)
+
+    context = SignalContext(ecg, 500)
+    artifacts_first = detector.detect_artifacts(ecg, context=context)
+    quality_second = assessor.assess_signal_quality(ecg, context=context)
+
+    context = SignalContext(ecg, 500)
+    quality_first = assessor.assess_signal_quality(ecg, context=context)
+    artifacts_second = detector.detect_artifacts(ecg, context=context)
+
+    assert quality_first['baseline_wander_amplitude'] == quality_second['baseline_wander_amplitude']
+    assert artifacts_first['baseline_wander']['amplitude'] == artifacts_second['baseline_wander']['amplitude']
+
+
+def test_lead_contexts_inherit_batched_results(ecg):
+    leads = np.stack([ecg, 2 * ecg])
+    context = SignalContext(leads, 500)
+    frequencies, psd = context.welch()
+    np.testing.assert_allclose(context.std(), [np.std(ecg), 2 * np.std(ecg)])
+
+    lead = context.lead(1)
+    assert lead.std() == context.std()[1]
+    np.testing.assert_array_equal(lead.welch()[1], psd[1])
+    assert context.lead(1) is lead
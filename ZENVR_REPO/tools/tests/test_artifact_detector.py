@@ -0,0 +1,84 @@
+"""
+Artifact Detector Tests
+"""
+import numpy as np
+import pytest
+
+from tools.data_processing.data_augmentation import generate_sample_ecg
+from tools.ecg_analysis.artifact_detector import ARTIFACT_INTERVAL_DTYPE, ECGArtifactDetector
+
+
+@pytest.fixture
+def noisy():
+    rng = np.random.default_rng(0)
+    return np.cumsum(rng.standard_normal(20000)) * 0.01
+
+
+def test_segment_medians_match_per_index_windows(noisy):
+    detector = ECGArtifactDetector(sampling_rate=500)
+    indices = np.sort(np.random.default_rng(1).choice(len(noisy), 2000, replace=False))
+    n = len(noisy)
+    indices = np.union1d(indices, [0, 1, 24, 25, n - 26, n - 25, n - 2, n - 1])
+
+    medians = detector._segment_medians(noisy, indices, 50)
+
+    expected = np.array([np.median(noisy[max(0, i - 25):min(n, i + 25)]) for i in indices])
+    np.testing.assert_allclose(medians, expected)
+    edges = np.isin(indices, [0, 1, n - 2, n - 1])
+    np.testing.assert_allclose(medians[edges], expected[edges])
+
+
+def test_remove_artifacts_patches_pops(noisy):
+    detector = ECGArtifactDetector(sampling_rate=500)
+    spiked = noisy.copy()
+    spiked[[1000, 5000]] += 5.0
+    artifacts = {
+        'motion_artifacts': {'indices': np.array([], dtype=int)},
+        'electrode_pops': {'indices': np.array([0, 1000, 5000])},
+        'baseline_wander': {'has_excessive_wander': False},
+    }
+
+    cleaned = detector.remove_artifacts(spiked, artifacts)
+
+    assert cleaned[1000] == pytest.approx((spiked[999] + spiked[1001]) / 2)
+    assert cleaned[0] == spiked[0]
+    np.testing.assert_array_equal(spiked[1:1000], cleaned[1:1000])
+
+
+def test_bands_above_nyquist_are_skipped(noisy):
+    detector = ECGArtifactDetector(sampling_rate=200)
+
+    artifacts = detector.detect_artifacts(noisy)
+
+    assert detector.filter_bank().skipped == ['electrosurgical']
+    assert not artifacts['electrosurgical_noise']['band_available']
+    assert artifacts['summary']['primary_artifact']
+
+
+def test_chunked_intervals_match_whole_signal_segments():
+    np.random.seed(0)
+    ecg = generate_sample_ecg(sampling_rate=500, duration=120.0)
+    ecg[20000:22000] += 1.5 * np.random.randn(2000)
+    detector = ECGArtifactDetector(sampling_rate=500)
+
+    whole = detector.detect_artifacts(ecg)
+    intervals = detector.detect_artifact_intervals(ecg, chunk_s=40.0)
+    streamed = detector.detect_artifact_intervals((ecg[i:i + 999] for i in range(0, len(ecg), 999)), chunk_s=40.0)
+
+    assert intervals.dtype == ARTIFACT_INTERVAL_DTYPE
+    np.testing.assert_array_equal(intervals, streamed)
+    muscle = intervals[intervals['type'] == 'muscle_noise']
+    np.testing.assert_array_equal(np.column_stack((muscle['start'], muscle['end'])), whole['muscle_noise']['segments'])
+    assert np.all(muscle['severity'] > 1)
+
+
+def test_multi_lead_summary_per_lead(noisy):
+    detector = ECGArtifactDetector(sampling_rate=500)
+    leads = np.stack([noisy, noisy + 0.4 * np.sin(2 * np.pi * 50 * np.arange(len(noisy)) / 500)])
+
+    records = detector.detect_artifacts(leads)
+
+    assert len(records) == 2
+    single = detector.detect_artifacts(leads[1])
+    assert records['motion_count'][1] == single['motion_artifacts']['count']
+    assert records['powerline_ratio'][1] > records['powerline_ratio'][0]
@@ -0,0 +1,54 @@
+"""
+Baseline Estimation Tests
+"""
+import numpy as np
+import pytest
+
+from tools.ecg_analysis.baseline import BASELINE_METHODS, estimate_baseline
+
+SAMPLING_RATE = 500
+
+
+@pytest.fixture
+def wandering_ecg():
+    """Gaussian QRS-like beats every 0.8 s on a slow wander; returns (signal, wander, r_peaks)"""
+    t = np.arange(30 * SAMPLING_RATE) / SAMPLING_RATE
+    r_peaks = np.arange(400, len(t) - 400, 400)
+    beats = sum(np.exp(-0.5 * ((t - peak / SAMPLING_RATE) / 0.01) ** 2) for peak in r_peaks)
+    wander = 0.3 * np.sin(2 * np.pi * 0.15 * t)
+    return beats + wander, wander, r_peaks
+
+
+def test_fast_estimators_track_the_wander(wandering_ecg):
+    ecg, wander, r_peaks = wandering_ecg
+    core = slice(SAMPLING_RATE, -SAMPLING_RATE)
+    exact = estimate_baseline(ecg, SAMPLING_RATE, 'median')
+
+    for method in BASELINE_METHODS:
+        baseline = estimate_baseline(ecg, SAMPLING_RATE, method, r_peaks=r_peaks)
+        assert baseline.shape == ecg.shape
+        assert np.max(np.abs(baseline - wander)[core]) < 0.05, method
+    approximate = estimate_baseline(ecg, SAMPLING_RATE, 'decimated_median')
+    assert np.max(np.abs(approximate - exact)[core]) < 0.02
+
+
+def test_spline_detects_beats_when_r_peaks_are_missing(wandering_ecg):
+    ecg, _, r_peaks = wandering_ecg
+    given = estimate_baseline(ecg, SAMPLING_RATE, 'spline', r_peaks=r_peaks)
+    detected = estimate_baseline(ecg, SAMPLING_RATE, 'spline')
+    np.testing.assert_allclose(detected, given, atol=1e-9)
+
+
+def test_leads_are_estimated_independently(wandering_ecg):
+    ecg, _, r_peaks = wandering_ecg
+    leads = np.stack([ecg, -0.5 * ecg + 0.1])
+    for method in BASELINE_METHODS:
+        batched = estimate_baseline(leads, SAMPLING_RATE, method, r_peaks=r_peaks)
+        for lead in range(2):
+            single = estimate_baseline(leads[lead], SAMPLING_RATE, method, r_peaks=r_peaks)
+            np.testing.assert_allclose(batched[lead], single, atol=1e-9, err_msg=method)
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        estimate_baseline(np.zeros(100), SAMPLING_RATE, 'wavelet')
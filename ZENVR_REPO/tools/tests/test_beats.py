@@ -0,0 +1,39 @@
+"""
+Beat Matrix Tests
+"""
+import numpy as np
+
+from tools.ecg_analysis.beats import beat_matrix, beat_similarity, qrs_onsets
+
+
+def test_beat_matrix_drops_edge_beats():
+    x = np.arange(100.0)
+    beats, kept = beat_matrix(x, np.array([2, 20, 50, 95]), before=5, after=10)
+
+    np.testing.assert_array_equal(kept, [20, 50])
+    np.testing.assert_array_equal(beats[1], x[45:60])
+
+
+def test_similarity_matches_corrcoef():
+    rng = np.random.default_rng(0)
+    beats = rng.standard_normal((6, 40))
+    beats[3] = 1.0
+
+    similarity = beat_similarity(beats)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expected = np.corrcoef(beats)
+
+    np.testing.assert_allclose(similarity, expected, atol=1e-12)
+    assert np.isnan(similarity[3]).all()
+
+
+def test_qrs_onsets_per_lead():
+    ramp = np.zeros(200)
+    ramp[100:110] = np.arange(10.0)
+    ramp[110:120] = np.arange(10.0, 0, -1)
+    leads = np.stack([ramp, np.roll(ramp, -3)])
+
+    onsets, kept = qrs_onsets(leads, np.array([5, 110]), search=40)
+
+    np.testing.assert_array_equal(kept, [110])
+    np.testing.assert_array_equal(onsets, [[10], [13]])
@@ -0,0 +1,22 @@
+"""
+Chunk Iteration Tests
+"""
+import numpy as np
+
+from tools.ecg_analysis.chunks import overlapping_chunks
+
+
+def test_iterators_and_arrays_give_the_same_blocks():
+    x = np.arange(1000.0)
+    pieces = (x[i:i + 37] for i in range(0, len(x), 37))
+
+    from_array = list(overlapping_chunks(x, 300, 50))
+    from_iterator = list(overlapping_chunks(pieces, 300, 50))
+
+    assert [start for start, _, _ in from_array] == [0, 300, 600, 900]
+    for (start, block, offset), (start_it, block_it, offset_it) in zip(from_array, from_iterator):
+        assert (start, offset) == (start_it, offset_it)
+        np.testing.assert_array_equal(block, block_it)
+        assert block[offset] == start
+    assert len(from_array[1][1]) == 400
+    assert len(from_array[-1][1]) == 150
@@ -0,0 +1,69 @@
+"""
+Lempel-Ziv Complexity Tests
+"""
+import numpy as np
+import pytest
+
+from tools.ecg_analysis.complexity import (
+    lempel_ziv_complexity, lz76_count, multiscale_lempel_ziv, symbolize
+)
+
+
+def kaspar_schuster(seq):
+    """Reference LZ76 component count (Kaspar & Schuster, 1987)"""
+    n, c, l, i, k, k_max = len(seq), 1, 1, 0, 1, 1
+    while True:
+        if seq[i + k - 1] == seq[l + k - 1]:
+            k += 1
+            if l + k > n:
+                return c + 1
+        else:
+            k_max = max(k, k_max)
+            i += 1
+            if i == l:
+                c += 1
+                l += k_max
+                if l + 1 > n:
+                    return c
+                i, k, k_max = 0, 1, 1
+            else:
+                k = 1
+
+
+@pytest.mark.parametrize('n_levels', [2, 3, 5, 20])
+def test_count_matches_reference(n_levels):
+    rng = np.random.default_rng(n_levels)
+    for _ in range(200):
+        seq = rng.integers(0, n_levels, rng.integers(2, 150)).astype(np.uint8)
+        if rng.random() < 0.5:
+            seq = np.repeat(seq, rng.integers(1, 6))
+        assert lz76_count(seq) == kaspar_schuster(seq)
+
+
+def test_binary_symbolization_splits_at_median():
+    x = np.array([3.0, 1.0, 2.0, 2.0, 5.0])
+
+    np.testing.assert_array_equal(symbolize(x), [1, 0, 0, 0, 1])
+    assert set(symbolize(np.arange(100.0), n_levels=4)) == {0, 1, 2, 3}
+
+
+def test_normalized_complexity_and_degenerate_input():
+    rng = np.random.default_rng(0)
+    noise = rng.standard_normal(5000)
+    sine = np.sin(np.arange(5000) * 0.05)
+
+    assert lempel_ziv_complexity(noise) > 0.8
+    assert lempel_ziv_complexity(sine) < 0.1
+    assert lempel_ziv_complexity(np.ones(100)) == 0.0
+
+
+def test_windowed_and_multiscale():
+    x = np.random.default_rng(1).standard_normal(4000)
+
+    halves = [lempel_ziv_complexity(x[:2000], thresholds=[np.median(x)]),
+              lempel_ziv_complexity(x[2000:], thresholds=[np.median(x)])]
+    assert lempel_ziv_complexity(x, window=2000) == pytest.approx(np.mean(halves))
+
+    mlz = multiscale_lempel_ziv(x, scales=[1, 2, 4])
+    assert mlz[0] == lempel_ziv_complexity(x)
+    assert mlz[2] == lempel_ziv_complexity(x[:4000].reshape(-1, 4).mean(axis=1))
@@ -0,0 +1,39 @@
+"""
+Correlation Dimension Tests
+"""
+import numpy as np
+import pytest
+from scipy.spatial.distance import pdist
+
+from tools.ecg_analysis import dimension
+from tools.ecg_analysis.dimension import correlation_dimension, correlation_sum
+
+
+@pytest.fixture
+def points():
+    return np.random.default_rng(0).standard_normal((300, 3))
+
+
+def test_correlation_sum_matches_pdist_in_small_blocks(points, monkeypatch):
+    monkeypatch.setattr(dimension, 'PAIR_BLOCK_SIZE', 1000)
+    radii = np.linspace(0.1, 3.0, 15)
+    distances = pdist(points)
+    i, j = np.triu_indices(len(points), k=1)
+    far = distances[j - i > 5]
+
+    np.testing.assert_allclose(correlation_sum(points, radii), [(distances < r).mean() for r in radii])
+    np.testing.assert_allclose(correlation_sum(points, radii, theiler=5), [(far < r).mean() for r in radii])
+
+
+def test_subsampling_is_seeded(points):
+    radii = np.linspace(0.5, 2.0, 4)
+
+    first = correlation_sum(points, radii, max_points=100, random_state=3)
+    np.testing.assert_array_equal(first, correlation_sum(points, radii, max_points=100, random_state=3))
+
+
+def test_dimension_of_a_circle():
+    t = np.linspace(0, 200 * np.pi, 20000)
+    circle = np.column_stack((np.cos(t), np.sin(t)))
+
+    assert correlation_dimension(None, embedded=circle) == pytest.approx(1.0, abs=0.05)
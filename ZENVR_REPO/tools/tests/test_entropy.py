@@ -0,0 +1,54 @@
+"""
+Entropy Engine Tests
+"""
+import numpy as np
+import pytest
+
+from tools.ecg_analysis.entropy import (
+    approximate_entropy, sample_entropy, template_match_counts
+)
+
+
+def _brute_force_counts(signal, m, r):
+    """Reference all-pairs Chebyshev neighbour counts (self excluded)"""
+    templates = np.array([signal[i:i + m] for i in range(len(signal) - m + 1)])
+    distances = np.max(np.abs(templates[:, None, :] - templates[None, :, :]), axis=2)
+    return (distances <= r).sum(axis=1) - 1
+
+
+@pytest.mark.parametrize("m", [1, 2, 3])
+def test_match_counts_agree_with_brute_force(m):
+    rng = np.random.default_rng(0)
+    signal = np.round(rng.standard_normal(400), 1)
+    r = 0.2 * np.std(signal)
+
+    counts_m, counts_m1 = template_match_counts(signal, m, r)
+
+    np.testing.assert_array_equal(counts_m, _brute_force_counts(signal, m, r))
+    np.testing.assert_array_equal(counts_m1, _brute_force_counts(signal, m + 1, r))
+
+
+def test_sample_entropy_matches_reference_definition():
+    rng = np.random.default_rng(1)
+    signal = rng.standard_normal(300)
+    r = 0.2 * np.std(signal)
+
+    n_m, n_m1 = len(signal) - 1, len(signal) - 2
+    B = _brute_force_counts(signal, 2, r).sum() / (n_m * (n_m - 1))
+    A = _brute_force_counts(signal, 3, r).sum() / (n_m1 * (n_m1 - 1))
+
+    assert sample_entropy(signal, m=2, r=r) == pytest.approx(-np.log(A / B))
+
+
+def test_approximate_entropy_is_distinct_from_sample_entropy():
+    t = np.linspace(0, 4, 800)
+    regular = np.sin(2 * np.pi * t)
+    noisy = np.random.default_rng(2).standard_normal(800)
+
+    assert approximate_entropy(regular) < approximate_entropy(noisy)
+    assert approximate_entropy(noisy) != pytest.approx(sample_entropy(noisy))
+
+
+def test_short_signal_returns_zero():
+    assert sample_entropy(np.array([1.0, 2.0])) == 0.0
+    assert approximate_entropy(np.array([1.0])) == 0.0
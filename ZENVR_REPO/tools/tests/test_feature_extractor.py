@@ -0,0 +1,161 @@
+"""
+ECG Feature Extractor Tests
+"""
+import numpy as np
+import pytest
+
+from tools.data_processing.data_augmentation import generate_sample_ecg
+from tools.ecg_analysis.feature_extractor import ECGFeatureExtractor
+
+METADATA = {'total_features', 'signal_length', 'sampling_rate'}
+
+
+class OffsetIntervalExtractor(ECGFeatureExtractor):
+    """Subclass overriding one group, to check workers run the caller's extractor"""
+
+    def _extract_interval_features(self, r_peaks):
+        return {name: value + 1000.0 for name, value in super()._extract_interval_features(r_peaks).items()}
+
+
+@pytest.fixture
+def extractor():
+    return ECGFeatureExtractor(sampling_rate=500)
+
+
+@pytest.fixture
+def ecg():
+    np.random.seed(0)
+    return generate_sample_ecg(sampling_rate=500, duration=6.0)
+
+
+def test_group_registry_matches_extracted_features(extractor, ecg):
+    features = extractor.extract_all_features(ecg)
+    registered = {name for names in extractor.GROUP_FEATURES.values() for name in names}
+
+    assert set(features) - METADATA == registered
+
+
+def test_group_selection_skips_unneeded_intermediates(extractor, ecg, monkeypatch):
+    calls = []
+    for builder in ('_preprocess_signal', '_detect_r_peaks', '_extract_beat_templates'):
+        original = getattr(extractor, builder)
+        monkeypatch.setattr(extractor, builder,
+                            lambda *args, _f=original, _n=builder: calls.append(_n) or _f(*args))
+
+    features = extractor.extract_all_features(ecg, r_peaks=np.arange(100, 3000, 400),
+                                              feature_groups=['interval'])
+
+    assert calls == []
+    assert set(features) - METADATA == set(extractor.GROUP_FEATURES['interval'])
+
+
+def test_beat_templates_are_built_once(extractor, ecg, monkeypatch):
+    calls = []
+    original = extractor._extract_beat_templates
+    monkeypatch.setattr(extractor, '_extract_beat_templates',
+                        lambda *args: calls.append(1) or original(*args))
+
+    extractor.extract_all_features(ecg, feature_groups=['morphological', 'waveform'])
+
+    assert len(calls) == 1
+
+
+def test_feature_selection_returns_only_requested(extractor, ecg):
+    features = extractor.extract_all_features(ecg, features=['interval_rmssd', 'spectral_centroid'])
+
+    assert set(features) - METADATA == {'interval_rmssd', 'spectral_centroid'}
+    assert features['total_features'] == 2
+
+
+def test_unknown_selection_raises(extractor, ecg):
+    with pytest.raises(ValueError):
+        extractor.extract_all_features(ecg, feature_groups=['bogus'])
+    with pytest.raises(ValueError):
+        extractor.extract_all_features(ecg, features=['bogus_feature'])
+
+
+def test_batch_extraction_matches_single_in_order(extractor):
+    np.random.seed(1)
+    signals = [generate_sample_ecg(sampling_rate=500, duration=d) for d in (3.0, 5.0, 4.0)]
+    groups = ['temporal', 'interval']
+
+    serial = extractor.extract_batch(signals, n_jobs=1, feature_groups=groups)
+    parallel = extractor.extract_batch(signals, n_jobs=2, chunksize=1, feature_groups=groups)
+
+    assert list(parallel.columns) == extractor.feature_columns(groups)
+    np.testing.assert_allclose(parallel.values, serial.values, equal_nan=True)
+    for row, ecg_signal in zip(serial.itertuples(index=False), signals):
+        single = extractor.extract_all_features(ecg_signal, feature_groups=groups)
+        np.testing.assert_allclose(row, [single.get(name, np.nan) for name in serial.columns],
+                                   equal_nan=True)
+
+
+def test_batch_workers_use_the_callers_configuration():
+    np.random.seed(2)
+    signals = [generate_sample_ecg(sampling_rate=500, duration=d) for d in (3.0, 4.0, 5.0, 3.5)]
+    extractor = OffsetIntervalExtractor(sampling_rate=500)
+    extractor.feature_groups = ['statistical', 'interval']
+
+    serial = extractor.extract_batch(signals, n_jobs=1)
+    parallel = extractor.extract_batch(signals, n_jobs=2, chunksize=1)
+
+    assert serial.shape == (4, len(extractor.feature_columns()))
+    assert list(parallel.columns) == list(serial.columns)
+    np.testing.assert_allclose(parallel.values, serial.values, equal_nan=True)
+    assert np.nanmin(parallel['interval_mean_rr']) > 1000
+
+
+def test_batch_structured_output_schema(extractor, ecg):
+    table = extractor.extract_batch([ecg, ecg], n_jobs=1, features=['interval_rmssd', 'temporal_std'],
+                                    output='structured')
+
+    assert table.dtype.names == ('interval_rmssd', 'temporal_std')
+    assert table['temporal_std'][0] == table['temporal_std'][1]
+
+
+def test_repeated_features_are_rejected(extractor, ecg):
+    repeated = ['interval_rmssd', 'temporal_std', 'interval_rmssd']
+    with pytest.raises(ValueError, match='interval_rmssd'):
+        extractor.feature_columns(features=repeated)
+    with pytest.raises(ValueError):
+        extractor.feature_schema(features=repeated)
+    with pytest.raises(ValueError):
+        extractor.extract_batch([ecg], n_jobs=1, features=repeated)
+
+
+def test_extract_into_writes_schema_row(extractor, ecg):
+    groups = ['temporal', 'interval', 'waveform']
+    expected = extractor.extract_all_features(ecg, feature_groups=groups)
+    columns = extractor.feature_columns(groups)
+
+    row = np.zeros((2, len(columns)), dtype=np.float32)
+    extractor.extract_into(ecg, row[1], feature_groups=groups)
+
+    assert not row[0].any()
+    np.testing.assert_allclose(row[1], [expected.get(name, np.nan) for name in columns],
+                               rtol=1e-6, equal_nan=True)
+
+    record = np.zeros(1, dtype=extractor.feature_schema(groups))
+    extractor.extract_into(ecg, record[0], feature_groups=groups)
+    assert record['interval_rmssd'][0] == pytest.approx(expected['interval_rmssd'])
+
+    with pytest.raises(ValueError):
+        extractor.extract_into(ecg, np.zeros(3), feature_groups=groups)
+
+
+def test_multi_lead_records_match_single_leads(extractor, ecg):
+    leads = np.stack([ecg, 0.5 * ecg + 0.01 * np.sin(np.arange(len(ecg)))])
+    groups = ['temporal', 'spectral', 'interval']
+
+    result = extractor.extract_all_features(leads, feature_groups=groups)
+
+    records = result['leads']
+    assert records.dtype == extractor.feature_schema(groups)
+    assert result['n_leads'] == 2
+    assert set(ECGFeatureExtractor.CROSS_LEAD_FEATURES) <= set(result)
+    assert result['cross_lead_correlation'] > 0.9
+    r_peaks = extractor._detect_consensus_r_peaks(extractor._preprocess_signal(leads))
+    for lead in range(2):
+        single = extractor.extract_all_features(leads[lead], r_peaks=r_peaks, feature_groups=groups)
+        for name in records.dtype.names:
+            assert records[name][lead] == pytest.approx(single[name], nan_ok=True)
@@ -0,0 +1,59 @@
+"""
+Filter Bank Tests
+"""
+import numpy as np
+import pytest
+from scipy import signal
+
+from tools.data_processing.data_augmentation import generate_sample_ecg
+from tools.ecg_analysis.filter_bank import FilterBank, design_sos, resolve_band, zero_phase_filter
+
+
+@pytest.fixture
+def ecg():
+    np.random.seed(0)
+    return generate_sample_ecg(sampling_rate=500, duration=4.0)
+
+
+def test_designs_are_cached_per_key():
+    assert design_sos(500, [0.5, 40], 3) is design_sos(500.0, (0.5, 40.0), 3)
+    assert design_sos(500, 0.5, 2, btype='low') is not design_sos(500, 0.5, 2, btype='high')
+
+    with pytest.raises(ValueError):
+        design_sos(500, 0.5, 2)
+
+
+def test_matches_transfer_function_filtfilt(ecg):
+    b, a = signal.butter(3, [0.5 / 250, 40.0 / 250], btype='band')
+
+    np.testing.assert_allclose(zero_phase_filter(ecg, 500, (0.5, 40.0), 3),
+                               signal.filtfilt(b, a, ecg), atol=1e-6)
+
+
+def test_batch_filters_along_axis(ecg):
+    batch = np.stack([ecg, -2 * ecg])
+    single = zero_phase_filter(ecg, 500, 100.0, 3, btype='high')
+
+    np.testing.assert_allclose(zero_phase_filter(batch, 500, 100.0, 3, btype='high')[1], -2 * single)
+    np.testing.assert_allclose(zero_phase_filter(batch.T, 500, 100.0, 3, btype='high', axis=0)[:, 0], single)
+
+
+def test_bands_are_fitted_below_nyquist():
+    assert resolve_band(500, (100, 1000)) == (100.0, 'high')
+    assert resolve_band(500, (0, 0.5)) == (0.5, 'low')
+    assert resolve_band(200, (100, 1000)) is None
+    assert resolve_band(500, 300.0, 'low') == (300.0, 'none')
+
+
+def test_bank_matches_individual_passes(ecg):
+    bank = FilterBank(200, {
+        'motion': ((0.1, 10.0), 3, None),
+        'baseline': (0.5, 2, 'low'),
+        'electrosurgical': ((100, 1000), 3, None),
+    })
+    bands = bank.decompose(np.stack([ecg, ecg]), axis=-1)
+
+    assert bank.skipped == ['electrosurgical']
+    assert set(bands) == {'motion', 'baseline'}
+    for name in bands:
+        np.testing.assert_allclose(bands[name][1], signal.sosfiltfilt(bank.sos[name], ecg))
@@ -0,0 +1,59 @@
+"""
+Fractal Scaling Kernel Tests
+"""
+import numpy as np
+import pytest
+
+from tools.ecg_analysis.fractal import segment_curves, segment_view
+
+
+@pytest.fixture
+def signal():
+    return np.random.default_rng(0).standard_normal(2000).cumsum() * 0.1
+
+
+def test_segment_view_drops_tail():
+    view = segment_view(np.arange(10.0), 3)
+
+    assert view.shape == (3, 3)
+    np.testing.assert_array_equal(view[-1], [6.0, 7.0, 8.0])
+
+
+def test_fluctuation_matches_polyfit_detrending(signal):
+    scales = [4, 16, 100]
+    profile = np.cumsum(signal - np.mean(signal))
+
+    expected = []
+    for scale in scales:
+        residuals = []
+        for segment in segment_view(profile, scale):
+            x = np.arange(scale)
+            trend = np.polyval(np.polyfit(x, segment, 1), x)
+            residuals.append(np.mean((segment - trend) ** 2))
+        expected.append(np.sqrt(np.mean(residuals)))
+
+    result = segment_curves(signal, scales, ('fluctuation',))['fluctuation']
+    np.testing.assert_allclose(result, expected, rtol=1e-9)
+
+
+def test_rescaled_range_and_box_count_match_loops(signal):
+    scales = [10, 64]
+    curves = segment_curves(signal, scales)
+
+    norm = (signal - signal.min()) / (signal.max() - signal.min() + 1e-10)
+    for idx, scale in enumerate(scales):
+        rs = []
+        for segment in segment_view(signal, scale):
+            cum_dev = np.cumsum(segment - segment.mean())
+            rs.append((cum_dev.max() - cum_dev.min()) / np.std(segment))
+        assert curves['rescaled_range'][idx] == pytest.approx(np.mean(rs))
+
+        boxes = segment_view(norm, scale)
+        extent = boxes.max(axis=1) - boxes.min(axis=1)
+        assert curves['box_count'][idx] == np.sum(np.ceil(extent * len(boxes) / scale))
+
+
+def test_unusable_scale_is_nan():
+    curves = segment_curves(np.zeros(50), [10, 100], ('rescaled_range',))
+
+    assert np.isnan(curves['rescaled_range']).all()
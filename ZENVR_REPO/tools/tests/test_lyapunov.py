@@ -0,0 +1,44 @@
+"""
+Largest Lyapunov Exponent Tests
+"""
+import numpy as np
+import pytest
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
+
+from tools.data_processing.data_augmentation import generate_sample_ecg
+from tools.ecg_analysis.analysis_context import SignalContext
+from tools.ecg_analysis.feature_extractor import ECGFeatureExtractor
+from tools.ecg_analysis.lyapunov import largest_lyapunov, nearest_neighbours
+
+
+def test_neighbours_respect_temporal_exclusion():
+    points = np.random.default_rng(0).standard_normal((400, 2)).cumsum(axis=0)
+    neighbours, distances = nearest_neighbours(points, theiler=15, usable=380, tree=cKDTree(points))
+
+    dense = cdist(points[:380], points[:380])
+    index = np.arange(380)
+    dense[np.abs(index[:, None] - index[None, :]) <= 15] = np.inf
+    np.testing.assert_array_equal(neighbours, dense.argmin(axis=1))
+    np.testing.assert_allclose(distances, dense.min(axis=1))
+
+
+def test_logistic_map_exponent():
+    x = np.empty(5000)
+    x[0] = 0.3
+    for i in range(1, len(x)):
+        x[i] = 4 * x[i - 1] * (1 - x[i - 1])
+
+    assert largest_lyapunov(x, m=2, tau=1, theiler=5, horizon=4) == pytest.approx(np.log(2), abs=0.01)
+
+
+def test_nonlinear_group_builds_one_embedding():
+    np.random.seed(0)
+    ecg = generate_sample_ecg(sampling_rate=500, duration=4.0)
+    extractor = ECGFeatureExtractor(500)
+    context = SignalContext(ecg, 500)
+
+    extractor.extract_all_features(ecg, feature_groups=['nonlinear'], context=context)
+
+    filtered = context.derive('filtered', lambda: None)
+    assert ('embedding',) + extractor.EMBEDDING in filtered
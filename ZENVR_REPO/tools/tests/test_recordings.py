@@ -0,0 +1,173 @@
+"""
+Recording Loader Tests
+"""
+import os
+
+import numpy as np
+import pytest
+
+from tools.data_processing import recordings
+from tools.data_processing.recordings import open_recording
+from tools.ecg_analysis.chunks import overlapping_chunks
+
+
+@pytest.fixture
+def leads():
+    return np.random.default_rng(0).normal(size=(3, 5000))
+
+
+def test_npy_is_memory_mapped_and_read_by_range(tmp_path, leads):
+    np.save(tmp_path / 'leads.npy', leads)
+    recording = open_recording(str(tmp_path / 'leads.npy'), 500)
+
+    assert isinstance(recording.samples, np.memmap)
+    assert (recording.n_leads, recording.n_samples) == (3, 5000)
+    np.testing.assert_array_equal(recording.read(100, 200, 1), leads[1, 100:200])
+    np.testing.assert_array_equal(recording.read(leads=[2, 0]), leads[[2, 0]])
+
+
+def test_interleaved_raw_binary(tmp_path, leads):
+    np.rint(leads.T * 200).astype('<i2').tofile(tmp_path / 'leads.bin')
+    recording = open_recording(str(tmp_path / 'leads.bin'), 500, dtype='<i2', n_leads=3, gain=200)
+
+    np.testing.assert_allclose(recording.read(), leads, atol=0.5 / 200 + 1e-12)
+
+
+def test_csv_is_converted_once_to_an_int16_cache(tmp_path, leads):
+    data = leads.T.copy()
+    data[10, 1] = np.nan
+    header = 'I,II,III'
+    np.savetxt(tmp_path / 'leads.csv', data, delimiter=',', header=header, comments='')
+
+    recording = open_recording(str(tmp_path / 'leads.csv'), 500)
+    assert recording.samples.dtype == np.int16
+    assert recording.lead_names == ['I', 'II', 'III']
+    physical = recording.read()
+    # int16 quantization of each lead's range
+    np.testing.assert_allclose(physical, data.T, atol=np.ptp(leads) / 65534, equal_nan=True)
+    assert np.isnan(physical[1, 10])
+
+    stamp = os.path.getmtime(tmp_path / '.ecg_cache' / 'leads.csv.npy')
+    reopened = open_recording(str(tmp_path / 'leads.csv'), 500)
+    assert os.path.getmtime(tmp_path / '.ecg_cache' / 'leads.csv.npy') == stamp
+    np.testing.assert_array_equal(reopened.read(leads='II'), physical[1])
+
+
+@pytest.mark.parametrize('use_pyarrow', [True, False])
+def test_csv_text_columns_are_skipped(tmp_path, monkeypatch, leads, use_pyarrow):
+    if use_pyarrow and not recordings.PYARROW_AVAILABLE:
+        pytest.skip('pyarrow is not installed')
+    monkeypatch.setattr(recordings, 'PYARROW_AVAILABLE', use_pyarrow)
+    with open(tmp_path / 'labelled.csv', 'w') as handle:
+        handle.write('label,I,II\n')
+        for row, (first, second) in enumerate(leads[:2].T):
+            handle.write(f'beat {row},{first:.17g},{second:.17g}\n')
+
+    recording = open_recording(str(tmp_path / 'labelled.csv'), 500, cache_dir=str(tmp_path / 'cache'))
+    assert recording.lead_names == ['I', 'II']
+    np.testing.assert_allclose(recording.read(), leads[:2], atol=np.ptp(leads) / 65534)
+
+
+def test_csv_cache_falls_back_when_the_source_directory_is_not_writable(tmp_path, monkeypatch, leads):
+    archive = tmp_path / 'archive'
+    archive.mkdir()
+    np.savetxt(archive / 'leads.csv', leads.T, delimiter=',', header='I,II,III', comments='')
+    # A file where the cache directory would go cannot be written into
+    (archive / '.ecg_cache').write_text('')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'user'))
+
+    recording = open_recording(str(archive / 'leads.csv'), 500)
+    assert isinstance(recording.samples, np.memmap)
+    cached = os.listdir(tmp_path / 'user' / 'ecg_recordings')
+    assert len(cached) == 2 and not any(name.endswith('.tmp') for name in cached)
+    np.testing.assert_allclose(recording.read(), leads, atol=np.ptp(leads) / 65534)
+
+    # Neither location writable: converted in memory
+    monkeypatch.setenv('XDG_CACHE_HOME', str(archive / '.ecg_cache'))
+    in_memory = open_recording(str(archive / 'leads.csv'), 500)
+    assert not isinstance(in_memory.samples, np.memmap)
+    np.testing.assert_allclose(in_memory.read(), leads)
+    assert sorted(os.listdir(archive)) == ['.ecg_cache', 'leads.csv']
+
+
+def test_lead_views_and_windows_read_lazily(tmp_path, leads):
+    np.save(tmp_path / 'leads.npy', leads)
+    recording = open_recording(str(tmp_path / 'leads.npy'), 500)
+
+    blocks = list(overlapping_chunks(recording.lead(2), 2000, 100))
+    assert [start for start, _, _ in blocks] == [0, 2000, 4000]
+    np.testing.assert_array_equal(blocks[1][1], leads[2, 1900:4100])
+
+    windows = list(recording.windows(2000, 1000))
+    assert [start for start, _ in windows] == [0, 1000, 2000, 3000]
+    np.testing.assert_array_equal(windows[-1][1], leads[:, 3000:5000])
+
+
+def _pack_212(digital: np.ndarray) -> bytes:
+    """Frame-interleaved format 212 bytes of (n_samples, n_signals) 12-bit samples"""
+    flat = digital.ravel().astype(np.int64) & 0xFFF
+    flat = np.pad(flat, (0, len(flat) % 2)).reshape(-1, 2)
+    packed = np.stack([flat[:, 0] & 0xFF, ((flat[:, 0] >> 8) & 0x0F) | ((flat[:, 1] >> 4) & 0xF0),
+                       flat[:, 1] & 0xFF], axis=1)
+    return packed.astype(np.uint8).tobytes()
+
+
+def test_wfdb_format_212_and_16_ranges(tmp_path):
+    digital = np.random.default_rng(1).integers(-2048, 2048, size=(1001, 3))
+    digital[7, 2] = -2048  # invalid sample
+    (tmp_path / 'r212.dat').write_bytes(_pack_212(digital))
+    (tmp_path / 'r212.hea').write_text(
+        'r212 3 360 1001\n'
+        'r212.dat 212 200(10)/mV 12 0 0 0 0 MLII\n'
+        'r212.dat 212 200/mV 12 0 0 0 0 V1\n'
+        'r212.dat 212 100(-5)/mV 12 0 0 0 0 V5\n'
+    )
+    digital[:, 1].astype('<i2').tofile(tmp_path / 'r16.dat')
+    (tmp_path / 'r16.hea').write_text('r16 1 250\nr16.dat 16 400 16 0\n')
+
+    recording = open_recording(str(tmp_path / 'r212.hea'), 500)
+    assert recording.sampling_rate == 360 and recording.lead_names == ['MLII', 'V1', 'V5']
+    for start, stop, leads in ((0, 1001, [0, 1, 2]), (3, 8, [2, 0]), (999, 1001, [1])):
+        np.testing.assert_array_equal(recording.digital(start, stop, leads), digital[start:stop, leads].T)
+    np.testing.assert_allclose(recording.read(0, 5, 'MLII'), (digital[:5, 0] - 10) / 200)
+    assert np.isnan(recording.read(7, 8, 'V5')[0])
+
+    single = open_recording(str(tmp_path / 'r16.dat'), 500)
+    assert single.n_samples == 1001
+    np.testing.assert_allclose(single.read(), digital[:, 1] / 400)
+
+
+def _write_edf(path, signals, labels, record_samples, physical_range=(-5.0, 5.0), digital_range=(-32768, 32767)):
+    """Minimal EDF writer; signals[i] holds n_records * record_samples[i] digital values"""
+    n_records = len(signals[0]) // record_samples[0]
+    n = len(signals)
+
+    def fields(values, width):
+        return ''.join(str(value).ljust(width)[:width] for value in values)
+
+    header = ('0'.ljust(8) + ''.ljust(80) + ''.ljust(80) + '01.01.26' + '00.00.00'
+              + str(256 * (n + 1)).ljust(8) + 'EDF+C'.ljust(44) + str(n_records).ljust(8)
+              + '1'.ljust(8) + str(n).ljust(4))
+    header += (fields(labels, 16) + fields([''] * n, 80) + fields(['mV'] * n, 8)
+               + fields([physical_range[0]] * n, 8) + fields([physical_range[1]] * n, 8)
+               + fields([digital_range[0]] * n, 8) + fields([digital_range[1]] * n, 8)
+               + fields([''] * n, 80) + fields(record_samples, 8) + fields([''] * n, 32))
+    records = [np.concatenate([s[r * k:(r + 1) * k] for s, k in zip(signals, record_samples)])
+               for r in range(n_records)]
+    with open(path, 'wb') as handle:
+        handle.write(header.encode('ascii'))
+        handle.write(np.concatenate(records).astype('<i2').tobytes())
+
+
+def test_edf_signal_ranges_skip_annotation_channel(tmp_path):
+    rng = np.random.default_rng(2)
+    leads = [rng.integers(-32768, 32768, size=10 * 256) for _ in range(2)]
+    annotations = np.zeros(10 * 30, dtype=np.int64)
+    _write_edf(tmp_path / 'r.edf', [leads[0], annotations, leads[1]], ['ECG I', 'EDF Annotations', 'ECG II'],
+               [256, 30, 256])
+
+    recording = open_recording(str(tmp_path / 'r.edf'), 500)
+    assert recording.sampling_rate == 256 and recording.lead_names == ['ECG I', 'ECG II']
+    np.testing.assert_array_equal(recording.digital(250, 1030), np.stack(leads)[:, 250:1030])
+    # physical range -5..5 mV mapped from the full int16 range
+    np.testing.assert_allclose(recording.read(0, 4, 'ECG II'), (leads[1][:4] + 32768) * 10 / 65535 - 5)
@@ -0,0 +1,100 @@
+"""
+Recurrence Quantification Tests
+"""
+import numpy as np
+import pytest
+
+from tools.ecg_analysis import recurrence
+from tools.ecg_analysis.phase_space import delay_embed
+
+
+def _dense_rqa(signal, threshold, m, tau, l_min=2, v_min=2):
+    """Reference RQA on the full recurrence matrix"""
+    points = delay_embed(signal, m, tau)
+    dist = np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1))
+    matrix = dist < threshold
+    n = len(points)
+
+    diagonal = np.concatenate([
+        recurrence._line_lengths(np.diagonal(matrix, k)[None, :]) for k in range(1, n)
+    ])
+    vertical = recurrence._line_lengths(matrix.T)
+
+    histogram = np.bincount(diagonal[diagonal >= l_min])
+    p = histogram[histogram > 0] / histogram.sum()
+    return {
+        'recurrence_rate': matrix.mean(),
+        'determinism': diagonal[diagonal >= l_min].sum() / diagonal.sum(),
+        'laminarity': vertical[vertical >= v_min].sum() / vertical.sum(),
+        'trapping_time': vertical[vertical >= v_min].mean(),
+        'entropy': -np.sum(p * np.log(p)),
+    }
+
+
+def test_delay_embed_rows():
+    embedded = delay_embed(np.arange(10.0), m=3, tau=2)
+
+    assert embedded.shape == (6, 3)
+    np.testing.assert_array_equal(embedded[1], [1.0, 3.0, 5.0])
+
+
+@pytest.mark.parametrize("m,tau", [(1, 1), (3, 4)])
+def test_banded_rqa_matches_dense_matrix(monkeypatch, m, tau):
+    monkeypatch.setattr(recurrence, 'BAND_CELLS', 1000)
+    t = np.linspace(0, 2, 300)
+    signal = np.sin(2 * np.pi * 3 * t) + 0.2 * np.random.default_rng(0).standard_normal(300)
+    threshold = 0.2 * np.std(signal)
+
+    result = recurrence.recurrence_quantification(signal, threshold=threshold, m=m, tau=tau)
+    expected = _dense_rqa(signal, threshold, m, tau)
+
+    for key, value in expected.items():
+        assert result[key] == pytest.approx(value)
+
+
+def test_short_signal_returns_zero_features():
+    result = recurrence.recurrence_quantification(np.array([1.0]))
+
+    assert all(value == 0.0 for value in result.values())
+
+
+def _brute_force_returns(points, threshold, leave_ball):
+    """Reference first-return times by scanning forward from every point"""
+    times = []
+    for i in range(len(points)):
+        inside = np.sqrt(((points[i + 1:] - points[i]) ** 2).sum(axis=1)) < threshold
+        start = 0
+        if leave_ball:
+            outside = np.flatnonzero(~inside)
+            if len(outside) == 0:
+                continue
+            start = outside[0]
+        hits = np.flatnonzero(inside[start:])
+        if len(hits) > 0:
+            times.append(start + hits[0] + 1)
+    return np.array(times)
+
+
+@pytest.mark.parametrize("m,tau,leave_ball", [(1, 1, False), (1, 1, True), (3, 5, True)])
+def test_first_return_times_match_forward_scan(m, tau, leave_ball):
+    rng = np.random.default_rng(3)
+    t = np.linspace(0, 3, 1200)
+    signal = np.sin(2 * np.pi * 1.3 * t) + 0.1 * rng.standard_normal(1200)
+    threshold = 0.1 * np.std(signal)
+
+    times = recurrence.first_return_times(signal, threshold, m=m, tau=tau,
+                                          leave_ball=leave_ball, block=16)
+    expected = _brute_force_returns(delay_embed(signal, m, tau), threshold, leave_ball)
+
+    np.testing.assert_array_equal(times, expected)
+
+
+def test_normalized_rpde_is_bounded():
+    t = np.linspace(0, 10, 5000)
+    signal = np.sin(2 * np.pi * t) + 0.05 * np.random.default_rng(4).standard_normal(5000)
+
+    value = recurrence.recurrence_period_density_entropy(
+        signal, m=3, tau=10, leave_ball=True, normalize=True
+    )
+
+    assert 0.0 < value <= 1.0
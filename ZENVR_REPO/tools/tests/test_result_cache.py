@@ -0,0 +1,68 @@
+"""
+Result Cache Tests
+"""
+import os
+
+import numpy as np
+
+from tools.data_processing.data_augmentation import generate_sample_ecg
+from tools.ecg_analysis.artifact_detector import ECGArtifactDetector
+from tools.ecg_analysis.ecg_signal_quality import ECGSignalQualityAssessor
+from tools.ecg_analysis.result_cache import ResultCache
+
+
+def test_nested_results_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    result = {'score': 0.5, 'label': 'good', 'flag': True,
+              'inner': {'peaks': np.arange(4), 'count': 3}}
+    cache.put('entry', result)
+
+    loaded = cache.get('entry')
+    assert loaded['score'] == 0.5 and loaded['label'] == 'good' and loaded['flag'] is True
+    assert loaded['inner']['count'] == 3
+    np.testing.assert_array_equal(loaded['inner']['peaks'], np.arange(4))
+    assert cache.get('missing') is None
+
+
+def test_key_depends_on_signal_rate_version_and_params(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    x = np.arange(100.0)
+    key = cache.key(x, 500, 'analyzer', 1, {'order': 2})
+
+    assert cache.key(x.copy(), 500, 'analyzer', 1, {'order': 2}) == key
+    assert cache.key(x + 1, 500, 'analyzer', 1, {'order': 2}) != key
+    assert cache.key(x, 250, 'analyzer', 1, {'order': 2}) != key
+    assert cache.key(x, 500, 'analyzer', 2, {'order': 2}) != key
+    assert cache.key(x, 500, 'analyzer', 1, {'order': 3}) != key
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    for i, name in enumerate(('a', 'b', 'c')):
+        cache.put(name, {'values': np.random.default_rng(i).normal(size=1000)})
+        os.utime(tmp_path / f'{name}.npz', (i, i))
+    cache.get('a')  # most recently used now
+
+    cache.max_bytes = os.path.getsize(tmp_path / 'a.npz') + os.path.getsize(tmp_path / 'c.npz')
+    cache.evict()
+    assert sorted(os.listdir(tmp_path)) == ['a.npz', 'c.npz']
+
+
+def test_analyzers_serve_repeated_calls_from_the_cache(tmp_path):
+    ecg = generate_sample_ecg(sampling_rate=500, duration=10)
+    cache = ResultCache(str(tmp_path))
+    assessor = ECGSignalQualityAssessor(500, cache=cache)
+    detector = ECGArtifactDetector(500, cache=cache)
+
+    quality = assessor.assess_signal_quality(ecg)
+    artifacts = detector.detect_artifacts(ecg)
+    assert len(os.listdir(tmp_path)) == 2
+
+    assert assessor.assess_signal_quality(ecg) == quality
+    assert detector.detect_artifacts(ecg)['summary'] == artifacts['summary']
+    assert len(os.listdir(tmp_path)) == 2
+
+    # Changed settings are a different entry
+    assessor.quality_thresholds['snr_db'] = 10
+    assessor.assess_signal_quality(ecg)
+    assert len(os.listdir(tmp_path)) == 3
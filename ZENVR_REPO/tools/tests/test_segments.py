@@ -0,0 +1,34 @@
+"""
+Segment Run Tests
+"""
+import numpy as np
+
+from tools.ecg_analysis.segments import index_segments, mask_segments, merge_segments, segment_lengths
+
+
+def test_index_segments_bridge_small_gaps():
+    indices = np.array([3, 4, 5, 9, 10, 30, 31, 40])
+
+    np.testing.assert_array_equal(index_segments(indices), [[3, 6], [9, 11], [30, 32], [40, 41]])
+    np.testing.assert_array_equal(index_segments(indices, max_gap=4), [[3, 11], [30, 32], [40, 41]])
+    assert index_segments(np.array([], dtype=int)).shape == (0, 2)
+
+
+def test_mask_segments_match_index_runs():
+    rng = np.random.default_rng(0)
+    mask = rng.random(1000) < 0.6
+
+    segments = mask_segments(mask, min_length=2)
+
+    np.testing.assert_array_equal(segments, index_segments(np.flatnonzero(mask), min_length=2))
+    assert segment_lengths(segments).min() >= 2
+    assert segment_lengths(mask_segments(mask)).sum() == mask.sum()
+
+
+def test_merge_segments_joins_close_and_overlapping_runs():
+    segments = np.array([[50, 60], [0, 10], [10, 20], [5, 8], [62, 70]])
+
+    merged, groups = merge_segments(segments)
+    np.testing.assert_array_equal(merged, [[0, 20], [50, 60], [62, 70]])
+    np.testing.assert_array_equal(groups, [1, 0, 0, 0, 2])
+    np.testing.assert_array_equal(merge_segments(segments, max_gap=2)[0], [[0, 20], [50, 70]])
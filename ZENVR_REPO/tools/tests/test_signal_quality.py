@@ -0,0 +1,70 @@
+"""
+Signal Quality Assessor Tests
+"""
+import numpy as np
+import pytest
+
+from tools.data_processing.data_augmentation import generate_sample_ecg
+from tools.ecg_analysis.ecg_signal_quality import ECGSignalQualityAssessor
+
+
+@pytest.fixture
+def leads():
+    np.random.seed(0)
+    ecg = generate_sample_ecg(sampling_rate=500, duration=6.0)
+    leads = np.stack([ecg + 0.02 * np.random.randn(len(ecg)) for _ in range(3)])
+    leads[1, :300] = 0.0
+    leads[2, 1000:1200] = 8.0
+    return leads
+
+
+def test_multi_lead_records_match_single_leads(leads):
+    assessor = ECGSignalQualityAssessor(sampling_rate=500)
+
+    records = assessor.assess_signal_quality(leads)
+
+    assert len(records) == 3
+    for lead in range(3):
+        single = assessor.assess_signal_quality(leads[lead])
+        assert set(records.dtype.names) == set(single)
+        for name, value in single.items():
+            if isinstance(value, str):
+                assert records[name][lead] == value
+            else:
+                assert records[name][lead] == pytest.approx(value)
+    assert records['flatline_segments'][1] >= 1
+    assert records['clipped_high_count'][2] == 200
+
+
+def test_window_quality_flags_local_problems():
+    np.random.seed(0)
+    ecg = generate_sample_ecg(sampling_rate=500, duration=60.0) + 0.01 * np.random.randn(30000)
+    ecg[10000:15000] += 0.5 * np.sin(2 * np.pi * 50 * np.arange(5000) / 500)
+    assessor = ECGSignalQualityAssessor(sampling_rate=500)
+
+    quality = assessor.assess_windows(ecg, window_s=10.0, hop_s=10.0)
+
+    np.testing.assert_array_equal(quality['start'], np.arange(6) * 5000)
+    assert quality['powerline_ratio'][2] > assessor.quality_thresholds['powerline_noise']
+    assert quality['powerline_ratio'][0] < assessor.quality_thresholds['powerline_noise']
+    np.testing.assert_array_equal(assessor.usable_segments(quality), [[0, 10000], [15000, 30000]])
+    assert assessor.assess_windows(np.stack([ecg, ecg]), 10.0, 10.0).shape == (2, 6)
+
+
+def test_invalid_samples_only_affect_their_windows():
+    np.random.seed(0)
+    ecg = generate_sample_ecg(sampling_rate=500, duration=60.0) + 0.01 * np.random.randn(30000)
+    gapped = ecg.copy()
+    gapped[12000:13000] = np.nan
+    gapped[26000] = np.inf
+    assessor = ECGSignalQualityAssessor(sampling_rate=500)
+
+    clean = assessor.assess_windows(ecg, window_s=10.0, hop_s=10.0)
+    quality = assessor.assess_windows(gapped, window_s=10.0, hop_s=10.0)
+
+    np.testing.assert_allclose(quality['missing_fraction'], [0, 0, 0.2, 0, 0, 0.0002])
+    assert np.all(np.isfinite(quality['snr_db'])) and np.all(np.isfinite(quality['baseline_wander']))
+    assert not quality['usable'][2]
+    others = [0, 1, 3, 4, 5]
+    np.testing.assert_array_equal(quality['score'][others], clean['score'][others])
+    np.testing.assert_array_equal(quality['usable'][others], clean['usable'][others])
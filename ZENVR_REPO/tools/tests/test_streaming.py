@@ -0,0 +1,64 @@
+"""
+Streaming Feature Extraction Tests
+"""
+import numpy as np
+import pytest
+
+from tools.data_processing.data_augmentation import generate_sample_ecg
+from tools.ecg_analysis.feature_extractor import ECGFeatureExtractor
+from tools.ecg_analysis.streaming import RunningStats, StreamingFeatureExtractor
+
+
+@pytest.fixture
+def ecg():
+    np.random.seed(0)
+    return generate_sample_ecg(sampling_rate=500, duration=30.0)
+
+
+def feed(extractor, x, seed=0):
+    rng = np.random.default_rng(seed)
+    snapshots, pos = [], 0
+    while pos < len(x):
+        n = int(rng.integers(1, 700))
+        snapshots += extractor.update(x[pos:pos + n])
+        pos += n
+    return snapshots
+
+
+def test_running_stats_add_and_remove():
+    x = np.random.default_rng(0).standard_normal(100)
+    stats = RunningStats()
+    stats.add(x[:60])
+    stats.add(x[60:])
+    stats.remove(x[:30])
+
+    assert stats.mean == pytest.approx(np.mean(x[30:]))
+    assert stats.var == pytest.approx(np.var(x[30:]))
+
+
+def test_snapshots_do_not_depend_on_chunking(ecg):
+    a = feed(StreamingFeatureExtractor(500, window_s=10, hop_s=2), ecg, seed=0)
+    b = feed(StreamingFeatureExtractor(500, window_s=10, hop_s=2), ecg, seed=1)
+
+    assert [s['window_end'] for s in a] == list(range(5000, len(ecg) + 1, 1000))
+    for x, y in zip(a, b):
+        assert x.keys() == y.keys()
+        for key in x:
+            assert x[key] == pytest.approx(y[key], rel=1e-9, abs=1e-9)
+
+
+def test_rr_features_track_batch_extraction(ecg):
+    snapshot = feed(StreamingFeatureExtractor(500, window_s=10, hop_s=5), ecg)[-1]
+    batch = ECGFeatureExtractor(500).extract_all_features(ecg[-5000:], feature_groups=['interval'])
+
+    assert snapshot['n_beats'] == 10
+    assert snapshot['interval_mean_rr'] == pytest.approx(batch['interval_mean_rr'], rel=0.01)
+    assert snapshot['heart_rate'] == pytest.approx(60.0, rel=0.01)
+    assert snapshot['interval_pnn50'] == batch['interval_pnn50']
+
+
+def test_snapshot_feature_groups(ecg):
+    extractor = StreamingFeatureExtractor(500, window_s=4, hop_s=4, feature_groups=['statistical'])
+    snapshot = feed(extractor, ecg[:2000])[-1]
+
+    assert 'percentile_50' in snapshot
@@ -0,0 +1,38 @@
+"""
+Windowed Statistics Tests
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from tools.ecg_analysis.windowed import moving_moment, moving_rms, window_snr_db
+
+
+def test_moments_match_explicit_windows():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(500)
+    windows = sliding_window_view(x, 25)
+
+    np.testing.assert_allclose(moving_moment(x, 25), windows.mean(axis=1), atol=1e-12)
+    np.testing.assert_allclose(moving_rms(x, 25), np.sqrt((windows ** 2).mean(axis=1)), atol=1e-12)
+
+
+def test_lead_batches_along_either_axis():
+    rng = np.random.default_rng(1)
+    leads = rng.standard_normal((3, 400))
+
+    batched = moving_rms(leads, 40)
+    assert batched.shape == (3, 361)
+    np.testing.assert_allclose(batched[2], moving_rms(leads[2], 40))
+    np.testing.assert_allclose(moving_rms(leads.T, 40, axis=0).T, batched)
+    assert moving_rms(leads, 500).shape == (3, 0)
+
+
+def test_window_snr_flags_local_noise():
+    t = np.arange(2000) / 500
+    clean = np.sin(2 * np.pi * t)
+    noise = np.zeros_like(clean)
+    noise[1000:1250] = 0.5
+
+    snr = window_snr_db(clean, noise, 250)
+    assert np.isinf(snr[0])
+    assert np.isclose(np.min(snr), 10 * np.log10(2), atol=0.05)